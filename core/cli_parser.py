@@ -12,7 +12,7 @@ def parse_arguments():
     )
 
     # --- Mutually exclusive group for PRIMARY, STANDALONE actions ---
-    # Only one of these can be specified: run task (positional), create config, list, fix-json
+    # Only one of these can be specified: run task (positional), create config, list, all, fix-json
     group = parser.add_mutually_exclusive_group()
 
     # Positional argument: can be a task name or a direct config file path (for running OR editing)
@@ -36,6 +36,13 @@ def parse_arguments():
         help=MESSAGES["cli_list_help"]
     )
 
+    # --all flag: run every task in the config directory
+    group.add_argument(
+        "--all",
+        action="store_true",
+        help=MESSAGES["cli_all_help"]
+    )
+
     # --fix-json flag
     group.add_argument(
         "--fix-json",
@@ -61,6 +68,14 @@ def parse_arguments():
         help=MESSAGES["cli_edit_help"]
     )
 
+    # --jobs: parallel task limit for --all
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help=MESSAGES["cli_jobs_help"]
+    )
+
     # --update flag
     parser.add_argument(
         "--update",
@@ -122,6 +137,13 @@ def parse_arguments():
         help=MESSAGES["cli_verbose_help"]
     )
 
+    # Disable writing to the log file
+    parser.add_argument(
+        "--no-log-file",
+        action="store_true",
+        help=MESSAGES["cli_no_log_file_help"]
+    )
+
     # Overwrite flag for creation
     parser.add_argument(
         "--overwrite",
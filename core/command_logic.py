@@ -2,10 +2,37 @@
 
 import subprocess
 import os
+import re
+import shlex
 import sys
-from core.logger import log
+from core.logger import log, flush_console
 from core.messages import MESSAGES
 
+# Anything the shell would interpret beyond splitting words and removing quotes
+# (pipes, redirections, expansions, globs, comments, multiple lines).
+_SHELL_SYNTAX_RE = re.compile(r'[|&;<>()$`\\*?\[\]{}~#!\n]')
+# Commands that only exist inside the shell
+_SHELL_BUILTINS = frozenset(('.', ':', 'alias', 'break', 'cd', 'command', 'continue', 'eval', 'exec', 'exit',
+                             'export', 'getopts', 'hash', 'local', 'read', 'readonly', 'return', 'set', 'shift',
+                             'source', 'times', 'trap', 'type', 'ulimit', 'umask', 'unset', 'wait'))
+
+
+def _split_simple_command(command):
+    """
+    Returns the argv of a command that can be started without a shell, or None if it
+    needs one. Only on POSIX: cmd.exe quoting and builtins differ too much.
+    """
+    if os.name != 'posix' or _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError: # Unbalanced quotes; let the shell report it
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS or '=' in argv[0]: # 'VAR=value cmd'
+        return None
+    return argv
+
+
 def execute_command(command, task_name="", cwd=None, capture_output=False): # ADDED capture_output=False
     """
     Executes a shell command and logs its output.
@@ -18,31 +45,41 @@ def execute_command(command, task_name="", cwd=None, capture_output=False): # AD
 
     log(MESSAGES["command_executing"].format(command), level='normal', task_name=task_name)
 
-    if cwd and not os.path.isdir(cwd):
-        log(MESSAGES["command_error_cwd_not_exist"].format(cwd), level='error', task_name=task_name)
-        return (None, False)
+    if not capture_output:
+        flush_console() # The command writes straight to the terminal
 
     try:
         # Determine how to capture output
         stdout_dest = subprocess.PIPE if capture_output else None
         stderr_dest = subprocess.PIPE if capture_output else None
 
-        result = subprocess.run(
-            command,
-            cwd=cwd,
-            shell=True, # Execute command via shell
-            capture_output=capture_output, # Use the passed capture_output flag
-            text=True, # Ensure output is decoded as text
-            check=False # Do not raise CalledProcessError automatically
-        )
+        # A plain 'program args...' command is started directly, saving the shell process
+        result = None
+        argv = _split_simple_command(command)
+        if argv is not None:
+            try:
+                result = subprocess.run(argv, cwd=cwd, capture_output=capture_output, text=True, check=False)
+            except OSError:
+                # Whatever couldn't start directly (a builtin not listed above, a script
+                # without a '#!' line, a missing cwd) gets the shell, as before
+                result = None
+        if result is None:
+            result = subprocess.run(
+                command,
+                cwd=cwd,
+                shell=True, # Execute command via shell
+                capture_output=capture_output, # Use the passed capture_output flag
+                text=True, # Ensure output is decoded as text
+                check=False # Do not raise CalledProcessError automatically
+            )
 
         output_stdout = result.stdout.strip() if result.stdout else ""
         output_stderr = result.stderr.strip() if result.stderr else ""
 
         if output_stdout:
-            log(MESSAGES["command_stdout"].format(output_stdout), level='debug', task_name=task_name)
+            log(lambda: MESSAGES["command_stdout"].format(output_stdout), level='debug', task_name=task_name)
         if output_stderr:
-            log(MESSAGES["command_stderr"].format(output_stderr), level='debug', task_name=task_name)
+            log(lambda: MESSAGES["command_stderr"].format(output_stderr), level='debug', task_name=task_name)
 
         if result.returncode != 0:
             log(MESSAGES["command_failed_exit_code"].format(result.returncode), level='error', task_name=task_name)
@@ -51,8 +88,12 @@ def execute_command(command, task_name="", cwd=None, capture_output=False): # AD
         log(MESSAGES["command_execution_successful"], level='debug', task_name=task_name)
         return (output_stdout, True)
 
-    except FileNotFoundError:
-        log(MESSAGES["command_error_not_found"].format(command.split()[0]), level='error', task_name=task_name)
+    except (FileNotFoundError, NotADirectoryError):
+        # A missing cwd is only looked into here, when the command could not start
+        if cwd and not os.path.isdir(cwd):
+            log(MESSAGES["command_error_cwd_not_exist"].format(cwd), level='error', task_name=task_name)
+        else:
+            log(MESSAGES["command_error_not_found"].format(command.split()[0]), level='error', task_name=task_name)
         return (None, False)
     except Exception as e:
         log(MESSAGES["command_unexpected_error"].format(e), level='error', task_name=task_name)
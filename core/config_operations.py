@@ -15,7 +15,8 @@ DEFAULT_TASK_CONFIG = {
     "command_line": "echo 'Your command here (e.g., npm run build, python script.py)'",
     "default_commit_message": "Automated update",
     "generate_commit_message_command": None,
-    "handle_local_changes_before_pull": "auto_stash" # NEW FIELD: default to auto_stash
+    "handle_local_changes_before_pull": "auto_stash", # NEW FIELD: default to auto_stash
+    "min_run_interval": 0 # Seconds; 0 = always run (see Readme)
 }
 
 
@@ -127,28 +128,29 @@ def fix_config_files(config_dir):
     log(MESSAGES["config_finished_fixing_jsons"], level='step')
 
 
-def load_task_config(filepath):
+def load_task_config(filepath, exit_on_error=True):
     """
     Loads a JSON task configuration from the given filepath.
     Handles file not found, JSON decode errors, and non-dict JSONs.
-    Exits the script on error.
+    Exits the script on error, or logs it and returns None when exit_on_error is False.
     """
-    if not os.path.exists(filepath):
-        log(MESSAGES["cli_error_config_file_not_found"].format(filepath), level='error')
-        sys.exit(1)
-    
+    error = None
     try:
         with open(filepath, 'r') as f:
             task = json.load(f)
+    except FileNotFoundError:
+        error = MESSAGES["cli_error_config_file_not_found"].format(filepath)
     except json.JSONDecodeError as e:
-        log(MESSAGES["cli_error_invalid_json_format"].format(filepath, e), level='error')
-        sys.exit(1)
+        error = MESSAGES["cli_error_invalid_json_format"].format(filepath, e)
     except Exception as e:
-        log(MESSAGES["cli_error_unexpected_reading_config"].format(filepath, e), level='error')
-        sys.exit(1)
+        error = MESSAGES["cli_error_unexpected_reading_config"].format(filepath, e)
+    else:
+        if not isinstance(task, dict):
+            error = MESSAGES["cli_error_json_not_object"].format(filepath)
 
-    if not isinstance(task, dict):
-        log(MESSAGES["cli_error_json_not_object"].format(filepath), level='error')
-        sys.exit(1)
-    
+    if error:
+        log(error, level='error')
+        if exit_on_error:
+            sys.exit(1)
+        return None
     return task
\ No newline at end of file
@@ -1,54 +1,330 @@
 # core/git_logic.py
 
+import atexit
 import subprocess
+import sys
 import os
-from datetime import datetime
-from core.logger import log
+import re
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from core.logger import log, is_enabled, is_verbose, flush_console
 from core.messages import MESSAGES
 
-def _execute_git_command(command_parts, cwd, task_name, log_stdout_stderr=True):
+try:
+    import pygit2 # Optional: read-only status queries run in-process when available
+except ImportError:
+    pygit2 = None
+
+_GIT_EXE = ('git',)
+
+# Environment for every git child process, built once rather than copied per call.
+# LC_ALL=C keeps git's messages in English, which the conflict checks below match on.
+# GIT_OPTIONAL_LOCKS=0 stops read-only commands such as 'git status' from taking the
+# index lock to refresh it, so they never block on an editor or another git process.
+_GIT_ENV = dict(os.environ, LC_ALL='C', GIT_OPTIONAL_LOCKS='0')
+
+
+def set_git_env_default(name, value):
+    """Sets name=value in the environment of git child processes unless the user already set it."""
+    _GIT_ENV.setdefault(name, value)
+
+# Network-bound subcommands that benefit from letting Git parallelize itself.
+_PARALLEL_GIT_COMMANDS = frozenset(('fetch', 'pull', 'clone'))
+
+
+def _parallel_jobs_setting():
+    """
+    Returns the job count handed to Git's parallelism settings.
+    '0' lets Git pick a value based on the number of CPUs; the GITBACKUP_JOBS
+    environment variable can override it with an explicit number.
+    """
+    jobs = os.environ.get('GITBACKUP_JOBS', '').strip()
+    return jobs if jobs.isdigit() else '0'
+
+
+# Resolved once at import: the environment does not change during a run.
+_PARALLEL_JOBS = _parallel_jobs_setting()
+_PARALLEL_CONFIG_OVERRIDES = (
+    '-c', f'fetch.parallel={_PARALLEL_JOBS}',
+    '-c', f'submodule.fetchJobs={_PARALLEL_JOBS}',
+    '-c', f'pack.threads={_PARALLEL_JOBS}',
+)
+
+
+def _default_git_config_overrides(command_parts):
+    """
+    Returns the '-c key=value' options to prepend for the given Git subcommand.
+    Only fetch/pull/clone get the parallel fetch, submodule and pack settings.
+    """
+    if command_parts and command_parts[0] in _PARALLEL_GIT_COMMANDS:
+        return _PARALLEL_CONFIG_OVERRIDES
+    return ()
+
+
+def _failure_output(result):
+    """Concatenates stdout and stderr of a failed command for error reporting."""
+    return result.stdout.strip() + "\n" + result.stderr.strip()
+
+
+def _handle_default_result(result, task_name):
+    """Any non-zero exit code is a failure."""
+    if result.returncode != 0:
+        log(MESSAGES["git_command_failed"].format(result.returncode), level='error', task_name=task_name)
+        return _failure_output(result), False
+    return result.stdout.strip(), True
+
+
+def _handle_diff_result(result, task_name):
+    """For 'git diff', exit code 1 means differences were found, which is not an error."""
+    if result.returncode == 1:
+        return result.stdout.strip(), True
+    return _handle_default_result(result, task_name)
+
+
+def _handle_revert_result(result, task_name):
+    """
+    For 'git revert', exit code 1 means conflicts: not fatal, but it needs attention.
+    The combined output is returned with success=False so the caller can interpret it.
+    """
+    if result.returncode == 1:
+        log(MESSAGES["git_command_failed"].format(result.returncode), level='warning', task_name=task_name)
+        return _failure_output(result), False
+    return _handle_default_result(result, task_name)
+
+
+def _handle_predicate_result(result, task_name):
     """
-    Executes a Git command and logs its output.
+    For yes/no queries ('merge-base --is-ancestor', 'diff-index --quiet'), exit code 1
+    is the answer 'no' (success=False), not an error.
+    """
+    if result.returncode == 1:
+        log(lambda: MESSAGES["git_command_answered_no"].format(result.returncode), level='debug', task_name=task_name)
+        return result.stdout.strip(), False
+    return _handle_default_result(result, task_name)
+
+
+def _handle_stash_result(result, task_name):
+    """
+    For 'git stash', 'No stash entries found' (from 'stash pop' on an empty stash) is
+    an expected answer, not an error. It is returned with success=False, so the
+    caller can interpret it.
+    """
+    if result.returncode == 1 and _STASH_EMPTY_RE.search(result.stderr or result.stdout):
+        log(lambda: MESSAGES["git_stash_empty_exit"].format(result.returncode), level='debug', task_name=task_name)
+        return _failure_output(result), False
+    return _handle_default_result(result, task_name)
+
+
+# Subcommands whose exit codes need special interpretation.
+_RESULT_HANDLERS = {
+    'diff': _handle_diff_result,
+    'revert': _handle_revert_result,
+    'merge-base': _handle_predicate_result,
+    'diff-index': _handle_predicate_result,
+    'stash': _handle_stash_result,
+}
+
+
+# --- Short-lived cache for read-only queries ---
+# Results of read-only commands are reused for a couple of seconds within a run,
+# keyed on (repo path, command). Any other Git command run in the same repository
+# drops that repository's entries, so a cached answer never outlives a mutation.
+# Only local state is cached: 'ls-remote' describes the remote, which other clones
+# (or other tasks) can push to at any time, so it is always asked fresh.
+_GIT_CACHE = {} # (repo_key, command tuple, raw_output) -> (monotonic timestamp, stdout)
+_GIT_CACHE_TTL = 2.0
+_GIT_CACHE_LOCK = threading.Lock()
+_CACHEABLE_COMMAND_PREFIXES = (
+    ('status',),
+    ('branch', '--list'),
+    ('rev-parse',),
+)
+# Read-only commands that are not cached but must not invalidate the cache either.
+_NON_MUTATING_COMMANDS = frozenset(('log', 'diff', 'diff-index', 'show', 'ls-files', 'ls-remote', 'for-each-ref', 'cat-file', 'merge-base'))
+
+
+def _cache_repo_key(cwd):
+    return os.path.abspath(cwd) if cwd else ""
+
+
+def _is_cacheable(command_parts):
+    return any(tuple(command_parts[:len(prefix)]) == prefix for prefix in _CACHEABLE_COMMAND_PREFIXES)
+
+
+def invalidate_git_cache(repo_path=None):
+    """
+    Drops cached read-only query results for repo_path (or for every repository
+    when repo_path is None). Call it after anything outside of Git may have changed
+    the working tree, e.g. a task's command_line.
+    """
+    with _GIT_CACHE_LOCK:
+        if repo_path is None:
+            _GIT_CACHE.clear()
+            return
+        repo_key = _cache_repo_key(repo_path)
+        for key in [key for key in _GIT_CACHE if key[0] == repo_key]:
+            del _GIT_CACHE[key]
+
+
+def _cached_git_output(command_parts, cwd, raw_output=False):
+    """Returns the cached stdout of a read-only query if it is still fresh, else None. Runs nothing."""
+    with _GIT_CACHE_LOCK:
+        cached = _GIT_CACHE.get((_cache_repo_key(cwd), tuple(command_parts), raw_output))
+    if cached and time.monotonic() - cached[0] < _GIT_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _execute_git_command(command_parts, cwd, task_name, log_stdout_stderr=True, git_config_overrides=None, raw_output=False, capture_output=True, interactive=True):
+    """
+    Executes a Git command and logs its output, reusing a recent result for
+    read-only queries (see _CACHEABLE_COMMAND_PREFIXES).
+    Pass capture_output=False when the caller ignores stdout, and interactive=False
+    for background commands that must not prompt (see _run_git_command).
     Returns: (stdout: str, success: bool)
-    Special handling for 'git diff' where exit code 1 means differences found (not an error).
     """
-    cmd_str = "git " + " ".join(command_parts)
-    log(MESSAGES["git_executing_command"].format(cmd_str, cwd), level='debug', task_name=task_name)
+    if _is_cacheable(command_parts):
+        cache_key = (_cache_repo_key(cwd), tuple(command_parts), raw_output)
+        with _GIT_CACHE_LOCK:
+            cached = _GIT_CACHE.get(cache_key)
+        if cached and time.monotonic() - cached[0] < _GIT_CACHE_TTL:
+            log(lambda: MESSAGES["git_cache_hit"].format(" ".join(command_parts)), level='debug', task_name=task_name)
+            return cached[1], True
 
-    is_diff_command = command_parts[0] == 'diff'
-    is_revert_command = command_parts[0] == 'revert' # NEW: Identify revert commands
+        output, success = _run_git_command(command_parts, cwd, task_name, log_stdout_stderr, git_config_overrides, raw_output, capture_output, interactive)
+        if success and capture_output: # Uncaptured output is "", which must not answer a later capturing call
+            with _GIT_CACHE_LOCK:
+                _GIT_CACHE[cache_key] = (time.monotonic(), output)
+        return output, success
 
-    try:
-        result = subprocess.run(
-            ['git'] + command_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=False # Do not raise CalledProcessError automatically; we handle return codes manually
-        )
+    if command_parts[0] not in _NON_MUTATING_COMMANDS:
+        invalidate_git_cache(cwd)
+    return _run_git_command(command_parts, cwd, task_name, log_stdout_stderr, git_config_overrides, raw_output, capture_output, interactive)
 
-        if log_stdout_stderr and result.stdout:
-            log(MESSAGES["git_stdout"].format(result.stdout.strip()), level='debug', task_name=task_name)
-        if log_stdout_stderr and result.stderr:
-            log(MESSAGES["git_stderr"].format(result.stderr.strip()), level='debug', task_name=task_name)
 
-        # Special handling for git diff: exit code 1 means differences found (success for our purpose)
-        if is_diff_command and result.returncode == 1:
-            log(MESSAGES["git_command_failed"].format(result.returncode), level='debug', task_name=task_name) # Log as debug for diff
-            return result.stdout.strip(), True # Treat as success
-        
-        # NEW: Special handling for git revert: exit code 1 means conflicts (not a fatal error, but needs attention)
-        if is_revert_command and result.returncode == 1:
-            log(MESSAGES["git_command_failed"].format(result.returncode), level='warning', task_name=task_name)
-            # Signal conflict by returning false, and let calling function interpret
-            return result.stdout.strip() + "\n" + result.stderr.strip(), False 
-        
-        # For all other commands, or if diff/revert command had a fatal error (exit code > 1)
-        if result.returncode != 0:
-            log(MESSAGES["git_command_failed"].format(result.returncode), level='error', task_name=task_name)
-            return result.stdout.strip() + "\n" + result.stderr.strip(), False # Indicate failure (concat stdout/stderr for error message)
-        
-        return result.stdout.strip(), True # Success (exit code 0)
+# --- Concurrency limit ---
+# Upper bound on git processes running at the same time. About 3/4 of the CPUs:
+# --all fans out over many repositories from threads, and this ceiling keeps them
+# from starting one git process each all at once.
+_GIT_SEM = threading.BoundedSemaphore(max(1, (os.cpu_count() or 4) * 3 // 4))
+
+
+def _build_git_argv(command_parts, git_config_overrides=None):
+    if git_config_overrides is None:
+        git_config_overrides = _default_git_config_overrides(command_parts)
+    return _GIT_EXE + tuple(git_config_overrides) + tuple(command_parts)
+
+
+def _log_git_command(argv, cwd, task_name):
+    # The argv join only happens if the debug line is actually emitted
+    log(lambda: MESSAGES["git_executing_command"].format(" ".join(argv), cwd), level='debug', task_name=task_name)
+
+
+def _process_git_result(result, command_parts, task_name, log_stdout_stderr=True, raw_output=False, interactive=True):
+    """
+    Logs the output of a finished Git command and interprets its exit code.
+    A failed non-interactive command is only logged at debug level: its caller
+    falls back to asking again in the foreground.
+    Returns: (stdout: str, success: bool)
+    """
+    if log_stdout_stderr and is_enabled('debug'):
+        # Formatted lazily: log() only builds the text if the line is emitted
+        if result.stdout:
+            log(lambda: MESSAGES["git_stdout"].format(result.stdout.strip()), level='debug', task_name=task_name)
+        if result.stderr:
+            log(lambda: MESSAGES["git_stderr"].format(result.stderr.strip()), level='debug', task_name=task_name)
+
+    if not interactive and result.returncode != 0:
+        log(lambda: MESSAGES["git_command_failed"].format(result.returncode), level='debug', task_name=task_name)
+        return _failure_output(result), False
+
+    handler = _RESULT_HANDLERS.get(command_parts[0], _handle_default_result)
+    output, success = handler(result, task_name)
+    if raw_output and success:
+        output = result.stdout
+    return output, success
+
+
+# Lines of streamed output kept for the error report of a failed command.
+_STREAMED_TAIL_LINES = 50
+
+
+def _run_git_command(command_parts, cwd, task_name, log_stdout_stderr=True, git_config_overrides=None, raw_output=False, capture_output=True, interactive=True):
+    """
+    Runs a Git command in a subprocess (no caching) and logs its output.
+    Returns: (stdout: str, success: bool)
+    Special handling for 'git diff' where exit code 1 means differences found (not an error).
+    git_config_overrides is a sequence of '-c key=value' arguments placed before the
+    subcommand; when None, the defaults for the subcommand are used.
+    With raw_output=True, stdout is returned unstripped on success (needed for -z output).
+    With capture_output=False (and no verbose console output), stdout goes to DEVNULL
+    and stderr is only decoded when the command fails; the returned stdout is empty.
+    With capture_output=False in verbose mode, the output is logged line by line as
+    it arrives; only its last lines are kept, for the failure report.
+    With interactive=False, git runs with GIT_TERMINAL_PROMPT=0, so a remote that
+    needs a typed credential fails instead of prompting on the terminal.
+    """
+    env = _GIT_ENV if interactive else dict(_GIT_ENV, GIT_TERMINAL_PROMPT='0')
+    argv = _build_git_argv(command_parts, git_config_overrides)
+    _log_git_command(argv, cwd, task_name)
+    flush_console() # Don't hold progress messages back while git runs
+
+    try:
+        if not capture_output and not is_verbose():
+            with _GIT_SEM:
+                lean_result = subprocess.run(
+                    argv,
+                    cwd=cwd,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    check=False
+                )
+            stderr = lean_result.stderr.decode('utf-8', errors='replace') if lean_result.returncode != 0 else ""
+            result = subprocess.CompletedProcess(argv, lean_result.returncode, "", stderr)
+        elif not capture_output:
+            tail = deque(maxlen=_STREAMED_TAIL_LINES)
+            with _GIT_SEM:
+                with subprocess.Popen(
+                    argv,
+                    cwd=cwd,
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    encoding='utf-8',
+                    errors='replace'
+                ) as proc:
+                    for line in proc.stdout:
+                        line = line.rstrip('\n')
+                        tail.append(line)
+                        log(MESSAGES["git_output_line"].format(line), level='debug', task_name=task_name)
+                        flush_console()
+                    returncode = proc.wait()
+            result = subprocess.CompletedProcess(argv, returncode, "", "\n".join(tail) if returncode != 0 else "")
+            # Every line was logged already
+            return _process_git_result(result, command_parts, task_name, log_stdout_stderr=False, raw_output=raw_output, interactive=interactive)
+        else:
+            with _GIT_SEM:
+                raw_result = subprocess.run(
+                    argv,
+                    cwd=cwd,
+                    env=env,
+                    capture_output=True,
+                    check=False # Do not raise CalledProcessError automatically; we handle return codes manually
+                )
+            # Decoded in one pass each, as UTF-8 whatever the locale (git writes paths and messages as UTF-8)
+            result = subprocess.CompletedProcess(
+                argv,
+                raw_result.returncode,
+                raw_result.stdout.decode('utf-8', errors='replace'),
+                raw_result.stderr.decode('utf-8', errors='replace')
+            )
+        return _process_git_result(result, command_parts, task_name, log_stdout_stderr, raw_output, interactive)
 
     except FileNotFoundError:
         log(MESSAGES["git_error_not_found"], level='error', task_name=task_name)
@@ -57,26 +333,177 @@ def _execute_git_command(command_parts, cwd, task_name, log_stdout_stderr=True):
         log(MESSAGES["git_error_unexpected"].format(e), level='error', task_name=task_name)
         return "", False
 
+
+class PersistentGit:
+    """
+    A long-lived 'git cat-file --batch-check' process for one repository.
+    Object and ref lookups are written to its stdin one per line, so repeated
+    read-only queries share a single process instead of forking git each time.
+    The process is started on first use; use get_persistent_git() to obtain one.
+    """
+
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ['git', 'cat-file', '--batch-check=%(objectname) %(objecttype)'],
+                cwd=self.repo_path,
+                env=_GIT_ENV,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1 # Line buffered: one query, one answer
+            )
+        return self._proc
+
+    def object_info(self, rev):
+        """
+        Resolves rev (a ref name, hash, ...) through the batch process.
+        Returns (object_name, object_type), ('', 'missing') if it does not resolve,
+        or None if the batch process could not be used.
+        """
+        if not rev or '\n' in rev:
+            return None
+        with self._lock:
+            try:
+                proc = self._ensure_started()
+                proc.stdin.write(rev + '\n')
+                proc.stdin.flush()
+                answer = proc.stdout.readline().strip()
+            except (OSError, ValueError):
+                return None
+        if not answer:
+            return None
+        if answer.endswith(' missing') or answer.endswith(' ambiguous'):
+            return '', 'missing'
+        object_name, _, object_type = answer.partition(' ')
+        return object_name, object_type
+
+    def ref_exists(self, ref):
+        """Returns True/False if ref resolves to a commit, or None if the lookup failed."""
+        info = self.object_info(ref)
+        if info is None:
+            return None
+        return info[1] == 'commit'
+
+    def close(self):
+        with self._lock:
+            if self._proc is not None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=2)
+                except Exception:
+                    self._proc.kill()
+                self._proc = None
+
+
+_PERSISTENT_GIT = {} # abspath -> PersistentGit
+_PERSISTENT_GIT_LOCK = threading.Lock()
+
+
+def get_persistent_git(repo_path):
+    """Returns the shared PersistentGit for repo_path, creating it if needed."""
+    repo_key = _cache_repo_key(repo_path)
+    with _PERSISTENT_GIT_LOCK:
+        session = _PERSISTENT_GIT.get(repo_key)
+        if session is None:
+            session = _PERSISTENT_GIT[repo_key] = PersistentGit(repo_path)
+        return session
+
+
+@atexit.register
+def close_persistent_git(repo_path=None):
+    """
+    Stops the PersistentGit process of repo_path, or every one when repo_path is None.
+    Registered to run at interpreter exit.
+    """
+    with _PERSISTENT_GIT_LOCK:
+        if repo_path is None:
+            sessions = list(_PERSISTENT_GIT.values())
+            _PERSISTENT_GIT.clear()
+        else:
+            session = _PERSISTENT_GIT.pop(_cache_repo_key(repo_path), None)
+            sessions = [session] if session is not None else []
+    for session in sessions:
+        session.close()
+
+
+@dataclass(frozen=True)
+class RepoContext:
+    """
+    What one stat of '<repo>/.git' says about a repository.
+    git_dir is None when the path is not a repository; is_worktree is True when
+    '.git' is a file pointing at the real git directory (linked worktree, submodule).
+    """
+    path: str
+    git_dir: Optional[str]
+    is_worktree: bool = False
+
+
+# Repository contexts (by absolute path) resolved in this run. Only repositories are
+# remembered, so a path that becomes a repository later is noticed.
+_REPO_CONTEXTS = {}
+
+
+def get_repo_context(repo_path):
+    """Returns the RepoContext for repo_path, resolving it with a single stat on first use."""
+    repo_key = _cache_repo_key(repo_path)
+    context = _REPO_CONTEXTS.get(repo_key)
+    if context is not None:
+        return context
+
+    dot_git = os.path.join(repo_key, '.git')
+    try:
+        st = os.stat(dot_git) # One stat also proves repo_path exists
+    except OSError:
+        return RepoContext(repo_key, None)
+    if stat.S_ISDIR(st.st_mode):
+        context = RepoContext(repo_key, dot_git)
+    else:
+        # A '.git' file contains 'gitdir: <path>', relative to the repository
+        try:
+            with open(dot_git, 'r') as f:
+                pointer = f.readline().strip()
+        except OSError:
+            return RepoContext(repo_key, None)
+        if not pointer.startswith('gitdir:'):
+            return RepoContext(repo_key, None)
+        context = RepoContext(repo_key, os.path.normpath(os.path.join(repo_key, pointer[len('gitdir:'):].strip())), is_worktree=True)
+    _REPO_CONTEXTS[repo_key] = context
+    return context
+
+
+def is_initialized_repo(repo_path):
+    """Returns True if repo_path is a Git repository (see get_repo_context)."""
+    return get_repo_context(repo_path).git_dir is not None
+
+
 def initialize_repo(repo_path, origin_url=None, task_name=""):
     """Initializes a new Git repository and adds an origin."""
     log(MESSAGES["git_initializing_repo"].format(repo_path), level='step', task_name=task_name)
-    
-    # Check if directory exists, create if not
-    if not os.path.exists(repo_path):
-        log(MESSAGES["git_created_dir_for_repo"].format(repo_path), level='normal', task_name=task_name)
-        try:
-            os.makedirs(repo_path, exist_ok=True)
-        except Exception as e:
-            log(MESSAGES["git_error_creating_dir"].format(repo_path, e), level='error', task_name=task_name)
-            return False
 
     # Check if already a git repo
-    if os.path.exists(os.path.join(repo_path, '.git')):
+    if is_initialized_repo(repo_path):
         log(MESSAGES["git_repo_already_exists"].format(repo_path), level='normal', task_name=task_name)
         return True # Already initialized, consider it a success
 
+    # Create the directory if needed; FileExistsError saves a separate existence check
+    try:
+        os.makedirs(repo_path)
+        log(MESSAGES["git_created_dir_for_repo"].format(repo_path), level='normal', task_name=task_name)
+    except FileExistsError:
+        pass
+    except Exception as e:
+        log(MESSAGES["git_error_creating_dir"].format(repo_path, e), level='error', task_name=task_name)
+        return False
+
     # Initialize
-    _, success = _execute_git_command(['init'], cwd=repo_path, task_name=task_name)
+    _, success = _execute_git_command(['init'], cwd=repo_path, task_name=task_name, capture_output=False)
     if not success:
         log(MESSAGES["git_init_failed"].format(repo_path), level='error', task_name=task_name)
         return False
@@ -85,7 +512,7 @@ def initialize_repo(repo_path, origin_url=None, task_name=""):
     # Add origin if specified
     if origin_url:
         log(MESSAGES["git_adding_remote_origin"].format(origin_url), level='step', task_name=task_name)
-        _, success = _execute_git_command(['remote', 'add', 'origin', origin_url], cwd=repo_path, task_name=task_name)
+        _, success = _execute_git_command(['remote', 'add', 'origin', origin_url], cwd=repo_path, task_name=task_name, capture_output=False)
         if not success:
             log(MESSAGES["git_add_remote_failed"].format(origin_url), level='error', task_name=task_name)
             # Do not return False here, as the repo is initialized; just warn about origin
@@ -93,6 +520,93 @@ def initialize_repo(repo_path, origin_url=None, task_name=""):
             log(MESSAGES["git_add_remote_successful"].format(origin_url), level='success', task_name=task_name)
     return True
 
+def _submodule_changed(repo, path, flags):
+    """
+    Whether a submodule entry of repo.status() is a change '--ignore-submodules=dirty'
+    reports: a staged pointer change, or the submodule checked out at another commit
+    than the index records. libgit2 flags a dirty submodule worktree the same way
+    (WT_MODIFIED), so the commits are compared.
+    """
+    if flags & (pygit2.GIT_STATUS_INDEX_MODIFIED | pygit2.GIT_STATUS_INDEX_NEW | pygit2.GIT_STATUS_INDEX_DELETED):
+        return True
+    if not flags & pygit2.GIT_STATUS_WT_MODIFIED:
+        return False
+    submodule_repo = pygit2.Repository(os.path.join(repo.workdir, path))
+    return submodule_repo.head.target != repo.index[path].id
+
+
+def _get_repo_snapshot_pygit2(repo_path):
+    """
+    get_repo_snapshot() without a subprocess, using pygit2 (libgit2) in-process.
+    Mirrors '--ignore-submodules=dirty -unormal'. Returns None if pygit2 can't answer
+    (including pygit2 versions without the APIs used here), so the caller falls back
+    to 'git status'.
+    """
+    try:
+        repo = pygit2.Repository(repo_path)
+        if repo.is_bare:
+            return None
+        snapshot = {"branch": None, "upstream": None, "ahead": 0, "behind": 0, "dirty": False}
+        submodules = set(repo.listall_submodules())
+        snapshot["dirty"] = any(
+            path not in submodules or _submodule_changed(repo, path, flags)
+            for path, flags in repo.status(untracked_files="normal").items()
+        )
+
+        if repo.head_is_detached:
+            return snapshot
+        head_ref = repo.references.get('HEAD').target # 'refs/heads/<name>', also on an unborn branch
+        snapshot["branch"] = head_ref[len('refs/heads/'):] if head_ref.startswith('refs/heads/') else head_ref
+        if repo.head_is_unborn:
+            return snapshot
+
+        upstream = repo.branches.local[snapshot["branch"]].upstream
+        if upstream is not None:
+            snapshot["upstream"] = upstream.shorthand
+            snapshot["ahead"], snapshot["behind"] = repo.ahead_behind(repo.head.target, upstream.target)
+        return snapshot
+    except Exception: # GitError, or TypeError/AttributeError on pygit2 < 1.14
+        return None
+
+
+_SNAPSHOT_STATUS_COMMAND = ('status', '--porcelain=v2', '--branch', '--ignore-submodules=dirty', '-unormal')
+
+
+def get_repo_snapshot(repo_path, task_name=""):
+    """
+    Runs a single 'git status --porcelain=v2 --branch' and returns the current branch
+    state together with the dirty flag, so callers don't need separate processes
+    for each question. When pygit2 is installed, the same answer is read in-process
+    and no git process is started at all.
+    Returns a dict {branch, upstream, ahead, behind, dirty} or None on error.
+    'branch' is None for a detached HEAD; 'upstream' is None when not tracking.
+    """
+    if pygit2 is not None:
+        snapshot = _get_repo_snapshot_pygit2(repo_path)
+        if snapshot is not None:
+            return snapshot
+
+    stdout, success = _execute_git_command(_SNAPSHOT_STATUS_COMMAND, cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
+    if not success:
+        return None
+
+    snapshot = {"branch": None, "upstream": None, "ahead": 0, "behind": 0, "dirty": False}
+    for line in stdout.splitlines():
+        if not line.startswith('# '):
+            if line:
+                snapshot["dirty"] = True
+            continue
+        header = line[2:].split(' ')
+        if header[0] == 'branch.head' and len(header) > 1 and header[1] != '(detached)':
+            snapshot["branch"] = header[1]
+        elif header[0] == 'branch.upstream' and len(header) > 1:
+            snapshot["upstream"] = header[1]
+        elif header[0] == 'branch.ab' and len(header) > 2:
+            snapshot["ahead"] = int(header[1].lstrip('+'))
+            snapshot["behind"] = int(header[2].lstrip('-'))
+    return snapshot
+
+
 def checkout_or_create_branch(repo_path, branch_name, origin_name="origin", task_name=""):
     """
     Checks out an existing branch or creates a new one if it doesn't exist,
@@ -100,25 +614,48 @@ def checkout_or_create_branch(repo_path, branch_name, origin_name="origin", task
     """
     log(MESSAGES["git_checkout_or_create_branch_step"].format(branch_name), level='step', task_name=task_name)
 
+    # 0. Nothing to detect or checkout if the branch is already checked out
+    snapshot = get_repo_snapshot(repo_path, task_name)
+    if snapshot and snapshot["branch"] == branch_name:
+        log(MESSAGES["git_already_on_branch"].format(branch_name), level='normal', task_name=task_name)
+        log(MESSAGES["git_branch_op_completed"].format(branch_name), level='step', task_name=task_name)
+        return True
+
     # 1. Fetch remote to ensure we have up-to-date branch info
-    log(MESSAGES["git_fetching_remote"].format(origin_name), level='debug', task_name=task_name)
-    _, fetch_success = _execute_git_command(['fetch', origin_name], cwd=repo_path, task_name=task_name)
+    log(lambda: MESSAGES["git_fetching_remote"].format(origin_name), level='debug', task_name=task_name)
+    _, fetch_success = _execute_git_command(['fetch', origin_name], cwd=repo_path, task_name=task_name, capture_output=False)
     if not fetch_success:
         log(MESSAGES["git_fetch_failed_warning"].format(origin_name), level='warning', task_name=task_name)
         # Continue anyway, local branch operations might still work
 
-    # 2. Check if local branch exists
-    stdout_local, _ = _execute_git_command(['branch', '--list', branch_name], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
-    local_branch_exists = (branch_name in stdout_local)
+    # 2./3. Check if the branch exists locally and on the remote.
+    # After a successful fetch from a named remote its branches are mirrored under
+    # refs/remotes/<origin>/, so both answers are lookups on the batch process.
+    persistent_git = get_persistent_git(repo_path)
+    local_branch_exists = remote_branch_exists = None
+    if fetch_success and not any(c in origin_name for c in '/:\\'): # A remote name, not a URL or path
+        local_branch_exists = persistent_git.ref_exists(f"refs/heads/{branch_name}")
+        remote_branch_exists = persistent_git.ref_exists(f"refs/remotes/{origin_name}/{branch_name}")
+
+    if local_branch_exists is None or remote_branch_exists is None:
+        # The two checks are independent, so the local one runs while ls-remote waits on the network.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            remote_future = executor.submit(_execute_git_command, ['ls-remote', '--heads', origin_name, branch_name], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
+
+            local_branch_exists = persistent_git.ref_exists(f"refs/heads/{branch_name}")
+            if local_branch_exists is None:
+                # Batch process unavailable, fall back to a one-shot query
+                stdout_local, _ = _execute_git_command(['branch', '--list', branch_name], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
+                local_branch_exists = any(line.lstrip('* ').strip() == branch_name for line in stdout_local.splitlines())
 
-    # 3. Check if remote branch exists
-    stdout_remote, _ = _execute_git_command(['ls-remote', '--heads', origin_name, branch_name], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
-    remote_branch_exists = bool(stdout_remote.strip())
+            stdout_remote, _ = remote_future.result()
+
+        remote_branch_exists = bool(stdout_remote.strip())
 
     if local_branch_exists:
         log(MESSAGES["git_branch_found_local"].format(branch_name), level='normal', task_name=task_name)
         log(MESSAGES["git_attempting_checkout_existing"].format(branch_name), level='normal', task_name=task_name)
-        _, success = _execute_git_command(['checkout', branch_name], cwd=repo_path, task_name=task_name)
+        _, success = _execute_git_command(['checkout', branch_name], cwd=repo_path, task_name=task_name, capture_output=False)
         if not success:
             log(MESSAGES["git_checkout_failed"].format(branch_name), level='error', task_name=task_name)
             return False
@@ -127,7 +664,7 @@ def checkout_or_create_branch(repo_path, branch_name, origin_name="origin", task
         log(MESSAGES["git_branch_found_remote"].format(branch_name, origin_name), level='normal', task_name=task_name)
         log(MESSAGES["git_creating_new_branch"].format(branch_name), level='normal', task_name=task_name)
         # Create local branch and set upstream to remote
-        _, success = _execute_git_command(['checkout', '-b', branch_name, f'{origin_name}/{branch_name}'], cwd=repo_path, task_name=task_name)
+        _, success = _execute_git_command(['checkout', '-b', branch_name, f'{origin_name}/{branch_name}'], cwd=repo_path, task_name=task_name, capture_output=False)
         if not success:
             log(MESSAGES["git_create_branch_failed"].format(branch_name), level='error', task_name=task_name)
             return False
@@ -137,14 +674,14 @@ def checkout_or_create_branch(repo_path, branch_name, origin_name="origin", task
         log(MESSAGES["git_branch_not_found_remote"].format(branch_name, origin_name), level='normal', task_name=task_name)
         log(MESSAGES["git_creating_new_branch"].format(branch_name), level='normal', task_name=task_name)
         # Create a brand new local branch (will need to push -u later)
-        _, success = _execute_git_command(['checkout', '-b', branch_name], cwd=repo_path, task_name=task_name)
+        _, success = _execute_git_command(['checkout', '-b', branch_name], cwd=repo_path, task_name=task_name, capture_output=False)
         if not success:
             log(MESSAGES["git_create_branch_failed"].format(branch_name), level='error', task_name=task_name)
             return False
         log(MESSAGES["git_create_checkout_successful"].format(branch_name), level='success', task_name=task_name)
         # Attempt to set upstream immediately for new local-only branches
         log(MESSAGES["git_pushing_new_branch"].format(branch_name, origin_name), level='normal', task_name=task_name)
-        _, push_success = _execute_git_command(['push', '-u', origin_name, branch_name], cwd=repo_path, task_name=task_name)
+        _, push_success = _execute_git_command(['push', '-u', origin_name, branch_name], cwd=repo_path, task_name=task_name, capture_output=False)
         if not push_success:
             log(MESSAGES["git_push_new_branch_failed_warning"].format(branch_name, origin_name), level='warning', task_name=task_name)
             # Not a fatal error, just a warning that upstream wasn't set
@@ -158,22 +695,39 @@ def _check_for_unstaged_changes(repo_path, task_name):
     Checks if there are any uncommitted changes (staged or unstaged, excluding untracked files with '??').
     Returns True if changes are found, False if no changes.
     """
-    # Use --porcelain=v1 to get a stable format, only showing changes to tracked files.
-    # We are interested in any status other than '??' (untracked).
-    stdout, success = _execute_git_command(['status', '--porcelain=v1'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
-    if not success:
-        log(MESSAGES["git_error_status_check"], level='error', task_name=task_name)
-        return False # Indicate error during check
+    # A status snapshot taken moments ago (checkout_or_create_branch takes one), with
+    # nothing run in the repository since, already lists the tracked changes.
+    stdout = _cached_git_output(_SNAPSHOT_STATUS_COMMAND, repo_path)
+    if stdout is None:
+        # Fast path: 'git diff-index --quiet' compares HEAD with the index and the stat
+        # data of tracked files only, without refreshing (and rewriting) the index, and
+        # stops at the first difference. Exit code 0 means clean. It can over-report files
+        # whose stat data changed but whose content did not, so a difference is confirmed
+        # with 'git status' below. Skipped on an unborn branch, where HEAD does not resolve yet.
+        head_info = get_persistent_git(repo_path).object_info('HEAD')
+        if head_info is not None and head_info[1] == 'commit':
+            _, is_clean = _execute_git_command(['diff-index', '--quiet', '--ignore-submodules=dirty', 'HEAD', '--'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, capture_output=False)
+            if is_clean:
+                log(MESSAGES["git_skipping_stash_no_changes"], level='normal', task_name=task_name)
+                return False
 
-    # Filter out untracked files ('??') from the status output
-    # This leaves 'M', 'A', 'D', 'R', 'C' etc. (staged or unstaged changes to tracked files)
-    lines_with_changes = [line for line in stdout.strip().splitlines() if not line.startswith('??')]
+        # Untracked files don't matter here, so '-uno' skips scanning for them entirely
+        # (the most expensive part of 'git status' on large trees). Submodules follow the
+        # snapshot's policy (_SNAPSHOT_STATUS_COMMAND): a moved submodule counts, work
+        # inside one doesn't, whichever path answers.
+        stdout, success = _execute_git_command(['status', '--porcelain=v2', '-uno', '--ignore-submodules=dirty'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
+        if not success:
+            log(MESSAGES["git_error_status_check"], level='error', task_name=task_name)
+            return False # Indicate error during check
+
+    # Every remaining entry is a staged or unstaged change to a tracked file
+    # ('1' ordinary, '2' rename/copy, 'u' unmerged); skip headers and untracked/ignored lines.
+    lines_with_changes = [line for line in stdout.strip().splitlines() if line and line[0] not in '#?!']
     
     if lines_with_changes:
         log(MESSAGES["git_local_changes_detected_pull_blocked"], level='normal', task_name=task_name)
-        # Log the actual changes at debug level
-        for line in lines_with_changes:
-            log(f"  Detected change: {line}", level='debug', task_name=task_name)
+        # Log the actual changes at debug level, as one lazily built entry
+        log(lambda: "\n".join(f"  Detected change: {line}" for line in lines_with_changes), level='debug', task_name=task_name)
         return True
     else:
         log(MESSAGES["git_skipping_stash_no_changes"], level='normal', task_name=task_name)
@@ -182,7 +736,7 @@ def _check_for_unstaged_changes(repo_path, task_name):
 def stash_local_changes(repo_path, task_name):
     """Stashes local changes (including untracked files) before a pull."""
     log(MESSAGES["git_auto_stashing_changes"], level='step', task_name=task_name)
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    timestamp = time.strftime("%Y%m%d%H%M%S")
     stash_message = f"gitb_auto_stash_{timestamp}" # Use timestamp for uniqueness
     stdout, success = _execute_git_command(['stash', 'push', '--include-untracked', '-m', stash_message], cwd=repo_path, task_name=task_name)
     
@@ -198,13 +752,20 @@ def stash_local_changes(repo_path, task_name):
     log(MESSAGES["git_stash_successful"], level='success', task_name=task_name)
     return True
 
+# Failure output of 'git stash pop' / 'git revert' that means conflicts (git runs with
+# LC_ALL=C, see _GIT_ENV, so the messages are always in English).
+_STASH_CONFLICT_RE = re.compile(r'conflict|could not apply all your changes', re.IGNORECASE)
+_REVERT_CONFLICT_RE = re.compile(r'conflict|merge', re.IGNORECASE)
+_STASH_EMPTY_RE = re.compile(r'no stash entries found', re.IGNORECASE)
+
+
 def pop_stashed_changes(repo_path, task_name):
     """Attempts to apply stashed changes back after a pull."""
     log(MESSAGES["git_stash_pop_applying"], level='step', task_name=task_name)
 
-    # Check if there are any stashes first
-    stdout_list, success_list = _execute_git_command(['stash', 'list'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
-    if not success_list or not stdout_list.strip():
+    # Check if there are any stashes first: refs/stash exists exactly while the stash is not empty.
+    # If the batch process is unavailable (None), pop straight away and read the answer from its output.
+    if get_persistent_git(repo_path).ref_exists('refs/stash') is False:
         log(MESSAGES["git_stash_pop_no_stash"], level='normal', task_name=task_name)
         return True # Nothing to pop, so consider it successful
 
@@ -212,9 +773,11 @@ def pop_stashed_changes(repo_path, task_name):
     stdout_pop, success_pop = _execute_git_command(['stash', 'pop'], cwd=repo_path, task_name=task_name)
     
     if not success_pop:
+        if _STASH_EMPTY_RE.search(stdout_pop):
+            log(MESSAGES["git_stash_pop_no_stash"], level='normal', task_name=task_name)
+            return True
         # Check for conflict indicators in stdout or stderr
-        if "Merge conflict" in stdout_pop or "conflict" in stdout_pop or \
-           "could not apply all your changes" in stdout_pop:
+        if _STASH_CONFLICT_RE.search(stdout_pop):
             log(MESSAGES["git_stash_pop_failed_conflict"], level='error', task_name=task_name)
         else:
             log(MESSAGES["git_stash_failed"].format(stdout_pop.strip()), level='error', task_name=task_name)
@@ -223,10 +786,128 @@ def pop_stashed_changes(repo_path, task_name):
     log(MESSAGES["git_stash_pop_successful"], level='success', task_name=task_name)
     return True
 
-def pull_updates(repo_path, branch, task_name=""):
-    """Performs a Git pull operation."""
+def _local_head_sha(repo_path, task_name):
+    """Returns the commit HEAD points at, or '' if it cannot be resolved."""
+    info = get_persistent_git(repo_path).object_info('HEAD')
+    if info is not None:
+        return info[0]
+    stdout, success = _execute_git_command(['rev-parse', '--verify', '-q', 'HEAD'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
+    return stdout.strip() if success else ''
+
+
+def _remote_head_sha(ls_remote_output, branch):
+    """Picks the hash of refs/heads/<branch> out of 'git ls-remote --heads' output."""
+    wanted = f"refs/heads/{branch}"
+    for line in ls_remote_output.splitlines():
+        sha, _, ref = line.partition('\t')
+        if ref.strip() == wanted:
+            return sha.strip()
+    return ''
+
+
+def _ls_remote_branch(repo_path, branch, task_name, origin="origin", interactive=True):
+    """Runs 'git ls-remote --heads <origin> <branch>' (never cached, see _GIT_CACHE)."""
+    return _execute_git_command(['ls-remote', '--heads', origin, branch], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, interactive=interactive)
+
+
+def prefetch_remote_branch(repo_path, branch, task_name="", origin="origin", interactive=True):
+    """
+    Looks up the commit origin's branch points at, for the remote_sha argument of
+    is_branch_in_sync and pull_updates. Meant to run in the background while local
+    checks run, so the network wait overlaps them; pass interactive=False there, so
+    it never prompts for credentials while a foreground git command may be prompting.
+    Returns the sha, '' if origin has no such branch, or None if the lookup failed
+    (is_branch_in_sync then asks again, in the foreground).
+    """
+    stdout, success = _ls_remote_branch(repo_path, branch, task_name, origin, interactive)
+    if not success:
+        return None
+    return _remote_head_sha(stdout, branch)
+
+
+def is_branch_in_sync(repo_path, branch, task_name="", remote_sha=None, origin="origin"):
+    """
+    Returns True if origin's branch already points at the local HEAD, in which case
+    a pull would fetch nothing and merge nothing. Pass remote_sha when it was just
+    looked up (prefetch_remote_branch); otherwise it is read with 'git ls-remote'.
+    Any doubt (lookup failure, missing branch, different commit) returns False.
+    """
+    if remote_sha is None:
+        remote_sha = prefetch_remote_branch(repo_path, branch, task_name, origin)
+    return bool(remote_sha) and remote_sha == _local_head_sha(repo_path, task_name)
+
+
+def fetch_updates(repo_path, branch, task_name="", origin="origin"):
+    """Fetches origin's branch into FETCH_HEAD without touching the working tree."""
+    _, success = _execute_git_command(['fetch', origin, branch], cwd=repo_path, task_name=task_name, capture_output=False)
+    return success
+
+
+def _is_ancestor(repo_path, ancestor, descendant, task_name):
+    """Returns True if commit ancestor is reachable from descendant (local check, no network)."""
+    _, is_ancestor = _execute_git_command(['merge-base', '--is-ancestor', ancestor, descendant], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, capture_output=False)
+    return is_ancestor
+
+
+def pull_touches_local_changes(repo_path, task_name=""):
+    """
+    After fetch_updates, tells whether pulling FETCH_HEAD could collide with the
+    uncommitted changes in the working tree. False only when the pull is a plain
+    fast-forward (or nothing) and no incoming path is modified or untracked locally;
+    a merge, or any failed lookup, returns True.
+    """
+    if not _local_head_sha(repo_path, task_name):
+        return True
+    if _is_ancestor(repo_path, 'FETCH_HEAD', 'HEAD', task_name):
+        return False # Nothing to pull
+    if not _is_ancestor(repo_path, 'HEAD', 'FETCH_HEAD', task_name):
+        return True # 'git pull' would merge or rebase
+
+    incoming, incoming_ok = _execute_git_command(['diff', '--name-only', '-z', '--no-renames', 'HEAD', 'FETCH_HEAD'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, raw_output=True)
+    tracked, tracked_ok = _execute_git_command(['diff', '--name-only', '-z', '--no-renames', 'HEAD'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, raw_output=True)
+    untracked, untracked_ok = _execute_git_command(['ls-files', '-z', '--others', '--exclude-standard', '--directory'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, raw_output=True)
+    if not (incoming_ok and tracked_ok and untracked_ok):
+        return True
+
+    local_paths = {path for path in tracked.split('\0') if path}
+    untracked_dirs = set()
+    for path in untracked.split('\0'):
+        if path.endswith('/'):
+            untracked_dirs.add(path) # '--directory' lists an untracked directory once, as 'dir/'
+        elif path:
+            local_paths.add(path)
+    untracked_dir_prefixes = tuple(untracked_dirs)
+    return any(
+        path in local_paths or path + '/' in untracked_dirs or path.startswith(untracked_dir_prefixes)
+        for path in incoming.split('\0') if path
+    )
+
+
+def pull_updates(repo_path, branch, task_name="", fetched=False, remote_sha=None, origin="origin"):
+    """
+    Brings the branch up to date with origin, skipped when it is already in sync.
+    Done as 'git fetch' plus a local 'git merge --ff-only', so the network part is a
+    plain fetch. If the branches have diverged, 'git pull' takes over so the user's
+    merge/rebase settings still apply. Pass fetched=True if fetch_updates just ran,
+    and remote_sha if origin's branch was just looked up (see is_branch_in_sync).
+    """
     log(MESSAGES["git_pulling_updates"].format(branch), level='normal', task_name=task_name)
-    _, success = _execute_git_command(['pull', 'origin', branch], cwd=repo_path, task_name=task_name)
+    if is_branch_in_sync(repo_path, branch, task_name, remote_sha=remote_sha, origin=origin):
+        log(MESSAGES["git_pull_already_up_to_date"].format(branch), level='normal', task_name=task_name)
+        return True
+    if not fetched and not fetch_updates(repo_path, branch, task_name, origin):
+        log(MESSAGES["git_pull_failed"].format(branch), level='error', task_name=task_name)
+        return False
+    if not _local_head_sha(repo_path, task_name):
+        # Unborn branch: leave it to 'git pull'
+        _, success = _execute_git_command(['pull', origin, branch], cwd=repo_path, task_name=task_name, capture_output=False)
+    elif _is_ancestor(repo_path, 'FETCH_HEAD', 'HEAD', task_name):
+        success = True # Only local commits on top of origin's branch; nothing to merge
+    elif _is_ancestor(repo_path, 'HEAD', 'FETCH_HEAD', task_name):
+        _, success = _execute_git_command(['merge', '--ff-only', 'FETCH_HEAD'], cwd=repo_path, task_name=task_name, capture_output=False)
+    else:
+        log(MESSAGES["git_pull_fast_forward_not_possible"].format(branch), level='normal', task_name=task_name)
+        _, success = _execute_git_command(['pull', origin, branch], cwd=repo_path, task_name=task_name, capture_output=False)
     if not success:
         log(MESSAGES["git_pull_failed"].format(branch), level='error', task_name=task_name)
         return False
@@ -238,55 +919,156 @@ def diff_changes(repo_path, task_name=""):
     Checks for all changes (staged, unstaged, untracked) in the repository
     and returns a boolean indicating if any changes are found.
     This is for `diff_changes` (for `git status` check) not `_check_for_unstaged_changes`.
+    The answer comes from the same status probe as get_repo_snapshot, which runs
+    'git status --porcelain=v2 -unormal --ignore-submodules=dirty'. '-unormal' reports
+    an untracked directory as a single entry instead of recursing into it, which is all
+    a yes/no answer needs. '--ignore-submodules=dirty' skips scanning submodule
+    worktrees: modified or untracked files inside a submodule are not reported, but a
+    submodule checked out at a different commit than recorded (a pointer change to
+    commit in this repository) is.
     """
     log(MESSAGES["git_checking_status"], level='normal', task_name=task_name)
-    stdout, success = _execute_git_command(['status', '--porcelain'], cwd=repo_path, task_name=task_name)
+    snapshot = get_repo_snapshot(repo_path, task_name)
     
-    if not success:
+    if snapshot is None:
         log(MESSAGES["git_error_status_check"], level='error', task_name=task_name)
         return None # Indicate error
     
-    if stdout.strip():
+    if snapshot["dirty"]:
         log(MESSAGES["git_changes_detected"], level='normal', task_name=task_name)
         return True
     else:
         log(MESSAGES["git_no_changes_detected"], level='normal', task_name=task_name)
         return False
 
+# Above this many changed paths, stage with the caller's pathspec instead of listing
+# every path on the command line.
+_MAX_EXPLICIT_ADD_PATHS = 256
+
+
+def _get_changed_paths(repo_path, task_name):
+    """
+    Runs a single 'git status --porcelain=v1 -z' and reports what needs committing.
+    Returns (has_changes: bool, unstaged_paths: list, has_untracked: bool) where
+    unstaged_paths holds the paths with worktree changes (modified, deleted or
+    untracked) that still need 'git add'. Returns (None, None, None) if the status
+    check failed.
+    """
+    stdout, success = _execute_git_command(['status', '--porcelain=v1', '-z'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, raw_output=True)
+    if not success:
+        log(MESSAGES["git_error_status_check"], level='error', task_name=task_name)
+        return None, None, None
+
+    has_changes = False
+    has_untracked = False
+    unstaged_paths = []
+    entries = iter(stdout.split('\0'))
+    for entry in entries:
+        if not entry:
+            continue
+        has_changes = True
+        status, path = entry[:2], entry[3:]
+        if status[1] != ' ':
+            unstaged_paths.append(path)
+            has_untracked = has_untracked or status == '??'
+        if 'R' in status or 'C' in status:
+            # With -z, the original path follows as its own field. The rename is
+            # already recorded in the index, so only the new path matters.
+            next(entries, None)
+    return has_changes, unstaged_paths, has_untracked
+
+
 def add_commit_changes(repo_path, commit_message_base, files_to_add=".", task_name=""):
     """
     Stages changes and commits them.
     Appends a timestamp to the commit message.
+    A single status check decides whether there is anything to do; when the tree is
+    clean, both 'git add' and 'git commit' are skipped. With the default '.' and no
+    untracked files, 'git commit -a' stages and commits in one process; otherwise only
+    the paths reported as changed are staged first.
     """
-    log(MESSAGES["git_staging_changes"].format(files_to_add), level='normal', task_name=task_name)
-    _, success = _execute_git_command(['add', files_to_add], cwd=repo_path, task_name=task_name)
-    if not success:
+    has_changes, unstaged_paths, has_untracked = _get_changed_paths(repo_path, task_name)
+    if has_changes is None:
         log(MESSAGES["git_add_failed"], level='error', task_name=task_name)
         return False
+    if not has_changes:
+        log(MESSAGES["git_nothing_to_commit"], level='normal', task_name=task_name)
+        return True # Nothing to commit is fine for us
+
+    commit_all = False
+    if files_to_add == "." and unstaged_paths and not has_untracked:
+        # Only tracked files changed: 'commit -a' picks up exactly what 'add -A .' would
+        add_cmd = None
+        commit_all = True
+    elif files_to_add != "." or len(unstaged_paths) > _MAX_EXPLICIT_ADD_PATHS:
+        add_cmd = ['add', files_to_add]
+    elif unstaged_paths:
+        add_cmd = ['add', '-A', '--'] + [f":(literal){path}" for path in unstaged_paths]
+    else:
+        add_cmd = None # Everything is already staged
+
+    if add_cmd:
+        log(MESSAGES["git_staging_changes"].format(files_to_add), level='normal', task_name=task_name)
+        _, success = _execute_git_command(add_cmd, cwd=repo_path, task_name=task_name, capture_output=False)
+        if not success:
+            log(MESSAGES["git_add_failed"], level='error', task_name=task_name)
+            return False
+        if files_to_add != "." and _local_head_sha(repo_path, task_name):
+            # A narrower pathspec may have staged nothing; 'git commit' would then fail
+            _, nothing_staged = _execute_git_command(['diff-index', '--cached', '--quiet', 'HEAD', '--'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, capture_output=False)
+            if nothing_staged:
+                log(MESSAGES["git_nothing_staged_for_pathspec"].format(files_to_add), level='normal', task_name=task_name)
+                return True
 
     # Append timestamp to the commit message
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     final_commit_message = f"{commit_message_base} [Auto@{timestamp}]"
 
+    commit_cmd = ['commit', '-a', '-m', final_commit_message] if commit_all else ['commit', '-m', final_commit_message]
+    if commit_all:
+        log(MESSAGES["git_staging_changes"].format(files_to_add), level='normal', task_name=task_name)
     log(MESSAGES["git_committing_changes"].format(final_commit_message), level='normal', task_name=task_name)
-    _, success = _execute_git_command(['commit', '-m', final_commit_message], cwd=repo_path, task_name=task_name)
+    _, success = _execute_git_command(commit_cmd, cwd=repo_path, task_name=task_name, capture_output=False)
     
-    # git commit returns 1 if "nothing to commit" which is fine for us (no new commit made)
-    # The _execute_git_command handles this by returning True if it's "nothing to commit"
+    # The checks above only let the commit run with something to commit, so any failure is real
     if not success:
         log(MESSAGES["git_commit_failed"], level='error', task_name=task_name)
         return False
     
     log(MESSAGES["git_add_commit_successful"], level='success', task_name=task_name)
-    return True # True means changes were added and a commit was attempted (might be "nothing to commit")
+    return True # True means the changes were committed
 
 
 def push_updates(repo_path, branch, origin="origin", task_name=""):
     """Performs a Git push operation."""
-    log(MESSAGES["git_pushing_changes"].format(branch, origin), level='normal', task_name=task_name)
-    _, success = _execute_git_command(['push', origin, branch], cwd=repo_path, task_name=task_name)
+    return push_updates_multi(repo_path, [branch], origin=origin, task_name=task_name)
+
+
+def push_updates_multi(repo_path, branches, origin="origin", task_name="", atomic=True):
+    """
+    Pushes several branches to the same remote in a single 'git push' invocation,
+    so the connection and authentication are paid once instead of once per branch.
+    With atomic=True (and more than one branch) '--atomic' is used, so either all
+    refs are updated on the remote or none are.
+    Returns True on success, False on error.
+    """
+    if not branches:
+        log(MESSAGES["git_push_no_branches"], level='normal', task_name=task_name)
+        return True
+
+    branches_str = ", ".join(branches)
+    log(MESSAGES["git_pushing_changes"].format(origin, branches_str), level='normal', task_name=task_name)
+
+    push_cmd = ['push']
+    if atomic and len(branches) > 1:
+        # A single-ref push is already atomic; only ask for it when it matters,
+        # since some older servers do not advertise the 'atomic' capability.
+        push_cmd.append('--atomic')
+    push_cmd += [origin] + list(branches)
+
+    _, success = _execute_git_command(push_cmd, cwd=repo_path, task_name=task_name, capture_output=False)
     if not success:
-        log(MESSAGES["git_push_failed"].format(branch, origin), level='error', task_name=task_name)
+        log(MESSAGES["git_push_failed"].format(origin, branches_str), level='error', task_name=task_name)
         return False
     log(MESSAGES["git_push_successful"], level='success', task_name=task_name)
     return True
@@ -300,7 +1082,7 @@ def get_last_commits(repo_path, num_commits=5, task_name=""):
     log(MESSAGES["git_showing_last_commits"].format(num_commits, repo_path), level='step', task_name=task_name)
     
     # Check if it's a Git repository
-    if not os.path.isdir(os.path.join(repo_path, '.git')):
+    if not is_initialized_repo(repo_path):
         log(MESSAGES["workflow_error_repo_not_valid"].format(task_name, repo_path), level='error')
         return False
 
@@ -320,7 +1102,8 @@ def get_last_commits(repo_path, num_commits=5, task_name=""):
         log(MESSAGES["git_no_commits_found"].format(repo_path), level='normal', task_name=task_name)
         return True # No commits, but command succeeded
         
-    print("\n" + stdout + "\n") # Print raw git log output for readability
+    flush_console() # Keep the header lines above the raw output
+    sys.stdout.write(f"\n{stdout}\n\n") # Print raw git log output for readability
     return True
 
 def revert_commit(repo_path, commit_hash, task_name=""):
@@ -331,13 +1114,16 @@ def revert_commit(repo_path, commit_hash, task_name=""):
     log(MESSAGES["git_revert_start"].format(commit_hash, repo_path), level='step', task_name=task_name)
 
     # Check if it's a Git repository
-    if not os.path.isdir(os.path.join(repo_path, '.git')):
+    if not is_initialized_repo(repo_path):
         log(MESSAGES["workflow_error_repo_not_valid"].format(task_name, repo_path), level='error')
         return False
 
     # Check if the commit hash exists (optional but good for user feedback)
-    stdout_check, success_check = _execute_git_command(['rev-parse', '--verify', commit_hash + '^{commit}'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False)
-    if not success_check:
+    commit_exists = get_persistent_git(repo_path).ref_exists(commit_hash + '^{commit}')
+    if commit_exists is None:
+        # Batch process unavailable, fall back to a one-shot query
+        _, commit_exists = _execute_git_command(['rev-parse', '--verify', commit_hash + '^{commit}'], cwd=repo_path, task_name=task_name, log_stdout_stderr=False, capture_output=False)
+    if not commit_exists:
         log(MESSAGES["git_revert_no_commit_found"].format(commit_hash, repo_path), level='error', task_name=task_name)
         return False
 
@@ -352,7 +1138,7 @@ def revert_commit(repo_path, commit_hash, task_name=""):
     else:
         # Check for merge conflict indicators in the stderr/stdout from _execute_git_command
         # _execute_git_command already concatenates stdout/stderr on failure
-        if "conflict" in stdout_revert.lower() or "merge" in stdout_revert.lower():
+        if _REVERT_CONFLICT_RE.search(stdout_revert):
             log(MESSAGES["git_revert_conflict"].format(commit_hash), level='error', task_name=task_name)
         else:
             log(MESSAGES["git_revert_failed"].format(commit_hash, "See logs above for details."), level='error', task_name=task_name)
@@ -1,6 +1,11 @@
 from datetime import datetime
+import atexit
+import functools
 import os
+import queue
 import sys
+import threading
+import time
 # from core.messages import MESSAGES # No longer needed directly in logger.py
 
 # ANSI escape codes for colors
@@ -16,39 +21,294 @@ class Colors:
     WHITE = "\033[97m"
     GRAY = "\033[90m" # Darker gray for debug
 
-# Module-level variable to control verbosity
+# Color only makes sense on a terminal. Decided once at import: when stdout is
+# redirected, or NO_COLOR is set (https://no-color.org), every code becomes "".
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    for _name in ('RESET', 'BOLD', 'RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'CYAN', 'WHITE', 'GRAY'):
+        setattr(Colors, _name, "")
+    del _name
+
+# Per-level console color, log-file label and default visibility, resolved once at
+# import so log() needs a single lookup instead of building a color map on every call.
+_LEVEL_COLORS = {
+    'debug': Colors.GRAY,
+    'info': Colors.BLUE,
+    'normal': Colors.RESET,
+    'step': Colors.CYAN,
+    'success': Colors.GREEN,
+    'warning': Colors.YELLOW,
+    'error': Colors.RED + Colors.BOLD, # Make errors bold
+    'critical': Colors.RED + Colors.BOLD # Critical errors also bold red
+}
+
+# Levels displayed on the console by default (without --verbose)
+_DEFAULT_DISPLAY_LEVELS = frozenset(('info', 'step', 'normal', 'success', 'warning', 'error', 'critical'))
+
+# Severity order used for the log file threshold (see set_file_min_level)
+_FILE_LEVEL_RANK = {
+    'debug': 0,
+    'normal': 1,
+    'info': 2,
+    'step': 3,
+    'success': 4,
+    'warning': 5,
+    'error': 6,
+    'critical': 7
+}
+
+# level -> (console prefix, b" | LABEL | " log-file separator, shown without --verbose, file rank)
+# Every console line already ends with a reset, so uncolored levels get an empty prefix
+# instead of a redundant leading reset code.
+_LEVEL_TABLE = {
+    level: ("" if color == Colors.RESET else color, f" | {level.upper()} | ".encode('utf-8'), level in _DEFAULT_DISPLAY_LEVELS, _FILE_LEVEL_RANK[level])
+    for level, color in _LEVEL_COLORS.items()
+}
+
+# Module-level variables to control verbosity and file logging
 _verbose_enabled = False
+_file_logging_enabled = True
+# Without --verbose, only messages ranked at least this high are written to the log file
+_file_min_level = _FILE_LEVEL_RANK['info']
+
+# Log file descriptor, opened on first use and kept open for the rest of the run.
+# log() only encodes the line and puts it on _log_queue; a background writer thread
+# collects lines in a bytearray and writes them with a single os.write() once
+# _LOG_FLUSH_BYTES are pending or the queue has been idle for _LOG_FLUSH_INTERVAL.
+_log_fd = None
+_log_queue = queue.SimpleQueue()
+_log_writer = None
+_log_writer_closed = False # Set at exit; later lines are written synchronously
+_log_writer_lock = threading.Lock()
+_LOG_FLUSH_BYTES = 8 * 1024
+_LOG_FLUSH_INTERVAL = 0.05 # seconds
+_FILE_FLUSH_LEVELS = frozenset(('error', 'critical')) # Written to disk immediately
+_FLUSH_NOW = object() # Queue marker: write what is pending without waiting
+
+# Console lines are collected and written with a single sys.stdout.write() per burst.
+# The buffer is flushed when it fills up, on levels the user must see right away,
+# and by flush_console() before anything else writes to the terminal.
+# Each line is stored as (color prefix, message, reset + newline) pieces, joined only on flush.
+_LOG_BUFFER = []
+_LOG_BUFFER_MAX = 16
+_LOG_BUFFER_MAX_PIECES = 3 * _LOG_BUFFER_MAX
+_LINE_END = Colors.RESET + "\n"
+_CONSOLE_FLUSH_LEVELS = frozenset(('step', 'success', 'warning', 'error', 'critical'))
+_console_lock = threading.Lock()
+
+# When several tasks run at once, their console lines interleave; each line is then
+# prefixed with '[task_name]'. The name comes from the log() call or, when the call
+# doesn't pass one, from the task the current thread is running (set_current_task).
+_console_task_prefix = False
+_thread_context = threading.local()
 
 def set_verbose(enabled: bool):
     """
     Sets the verbose mode for the logger.
     If enabled is True, debug messages and all other levels will be displayed.
+    Debug messages are only written to the log file in verbose mode as well.
     """
     global _verbose_enabled
     _verbose_enabled = enabled
 
+def set_file_logging(enabled: bool):
+    """
+    Enables or disables writing messages to the log file.
+    Console output is not affected.
+    """
+    global _file_logging_enabled
+    _file_logging_enabled = enabled
+
+def set_file_min_level(level):
+    """
+    Sets the lowest level written to the log file when verbose mode is off
+    (verbose runs always write every level). Defaults to 'info'.
+    """
+    global _file_min_level
+    if level not in _FILE_LEVEL_RANK:
+        raise ValueError(f"Unknown log level: {level!r}")
+    _file_min_level = _FILE_LEVEL_RANK[level]
+
+def set_console_task_prefix(enabled: bool):
+    """Prefixes console lines with '[task_name]', for runs where tasks share the terminal."""
+    global _console_task_prefix
+    _console_task_prefix = enabled
+
+def set_current_task(task_name):
+    """
+    Sets the task name used by log() calls on this thread that don't pass one.
+    Pass "" when the thread is done with the task.
+    """
+    _thread_context.task_name = task_name
+
+def is_verbose():
+    """Returns True if verbose (debug) console output is enabled."""
+    return _verbose_enabled
+
+def is_enabled(level):
+    """
+    Returns True if a message at the given level would be emitted anywhere
+    (console or log file). Callers can use it to skip building costly messages.
+    """
+    if _verbose_enabled:
+        return True
+    if level == 'debug':
+        return False
+    return level in _DEFAULT_DISPLAY_LEVELS or (_file_logging_enabled and _FILE_LEVEL_RANK.get(level, _FILE_LEVEL_RANK['info']) >= _file_min_level)
+
+@functools.lru_cache(maxsize=None)
 def get_log_file_path():
-    """Determines the log file path based on XDG Base Directory Specification."""
+    """
+    Determines the log file path based on XDG Base Directory Specification.
+    The result is cached: the environment it depends on does not change during a run.
+    Code that changes XDG_CONFIG_HOME/APPDATA afterwards must call
+    get_log_file_path.cache_clear() (and reopen the log file) to pick up the new path.
+    """
     xdg_config_home = os.environ.get('XDG_CONFIG_HOME')
     if xdg_config_home:
-        return os.path.join(xdg_config_home, 'git_automation', 'git_automation.log')
+        return f"{xdg_config_home}{os.sep}git_automation{os.sep}git_automation.log"
     else:
         # Fallback for systems not using XDG_CONFIG_HOME or for Windows
         if os.name == 'posix': # Linux, macOS, etc.
             home_dir = os.path.expanduser("~")
-            return os.path.join(home_dir, '.config', 'git_automation', 'git_automation.log')
+            return f"{home_dir}{os.sep}.config{os.sep}git_automation{os.sep}git_automation.log"
         elif os.name == 'nt': # Windows
             appdata = os.environ.get('APPDATA')
-            return os.path.join(appdata, 'git_automation', 'git_automation.log')
+            return f"{appdata}{os.sep}git_automation{os.sep}git_automation.log"
         else:
             # Generic fallback if OS not recognized
-            return os.path.join(os.getcwd(), 'git_automation.log')
+            return f"{os.getcwd()}{os.sep}git_automation.log"
+
+# Set once the log directory is known to exist, so it is created (and stat'ed) at
+# most once per process, and only when the log file is actually touched.
+_dir_ready = False
+
+def _ensure_dir():
+    """Creates the log directory on first use."""
+    global _dir_ready
+    if _dir_ready:
+        return
+    try:
+        os.makedirs(os.path.dirname(get_log_file_path()), exist_ok=True)
+    except OSError:
+        return # Reported by the open/write that follows
+    _dir_ready = True
+
+def _get_log_fd():
+    """Returns the shared append-only log file descriptor, opening it on first use."""
+    global _log_fd
+    if _log_fd is None:
+        _ensure_dir()
+        _log_fd = os.open(get_log_file_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    return _log_fd
+
+def _write_log_bytes(data):
+    """Appends data to the log file, normally with a single system call."""
+    try:
+        fd = _get_log_fd()
+        written = os.write(fd, data)
+        while written < len(data): # Only on a short write
+            written += os.write(fd, data[written:])
+    except OSError as e:
+        print(f"Error: Failed to write to log file {get_log_file_path()}: {e}")
+
+def _log_writer_loop():
+    """Background thread: drains _log_queue into the log file in batches."""
+    pending = bytearray()
+    while True:
+        try:
+            # Block while idle; with bytes pending, wait at most _LOG_FLUSH_INTERVAL for more
+            item = _log_queue.get(timeout=_LOG_FLUSH_INTERVAL) if pending else _log_queue.get()
+        except queue.Empty:
+            item = _FLUSH_NOW
+        if isinstance(item, bytes):
+            pending.extend(item)
+            if len(pending) < _LOG_FLUSH_BYTES:
+                continue
+        if pending:
+            _write_log_bytes(pending)
+            pending.clear()
+        if item is None: # Shutdown sentinel
+            return
+        if isinstance(item, threading.Event): # flush_log() is waiting for us
+            item.set()
+
+def _enqueue_log_bytes(data, flush_now=False):
+    """Hands an encoded line to the writer thread, starting it on first use."""
+    global _log_writer
+    if _log_writer_closed:
+        _write_log_bytes(data)
+        return
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(target=_log_writer_loop, name="log-writer", daemon=True)
+                _log_writer.start()
+    _log_queue.put(data)
+    if flush_now:
+        _log_queue.put(_FLUSH_NOW)
+
+def _flush_console_buffer():
+    """Writes the buffered console lines in one go. Caller holds _console_lock."""
+    if _LOG_BUFFER:
+        sys.stdout.write("".join(_LOG_BUFFER))
+        _LOG_BUFFER.clear()
+
+@atexit.register
+def flush_console():
+    """
+    Writes any buffered console output. Call it before output that bypasses log()
+    (prompts, child processes sharing the terminal, plain print()).
+    """
+    with _console_lock:
+        _flush_console_buffer()
+        sys.stdout.flush() # When piped, stdout is block-buffered; push it out before others write
+
+def flush_log():
+    """
+    Waits until every log line queued so far has been written to the log file.
+    Called at task boundaries so a finished task is fully on disk.
+    """
+    if _log_writer is None or not _log_writer.is_alive():
+        return
+    written = threading.Event()
+    _log_queue.put(written)
+    written.wait(timeout=5)
+
+@atexit.register
+def _close_log_file():
+    global _log_fd, _log_writer_closed
+    _log_writer_closed = True
+    if _log_writer is not None and _log_writer.is_alive():
+        _log_queue.put(None)
+        _log_writer.join(timeout=5)
+    if _log_fd is not None:
+        os.close(_log_fd)
+        _log_fd = None
+
+# task_name -> encoded "[task_name] " log-file prefix. Task names are few and reused
+# for every line of a workflow, so each prefix is built and encoded only once.
+_TASK_PREFIX_CACHE = {"": b""}
+
+# Log-file timestamps have one-second resolution, so the formatted string is reused
+# for every line within the same second. Stored as one tuple so threads never see
+# a second paired with another second's text.
+_last_timestamp = (-1, b"")
+
+def _timestamp():
+    """Returns the current local time as b'YYYY-MM-DD HH:MM:SS', formatted at most once per second."""
+    global _last_timestamp
+    second = int(time.time())
+    cached_second, text = _last_timestamp
+    if second != cached_second:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)).encode('ascii')
+        _last_timestamp = (second, text)
+    return text
 
 def clear_log_file():
     """Clears the content of the log file."""
     log_file_path = get_log_file_path()
-    log_dir = os.path.dirname(log_file_path)
-    os.makedirs(log_dir, exist_ok=True) # Ensure directory exists before trying to open file
+    flush_log() # Earlier lines belong before the truncation, not after it
+    _ensure_dir()
 
     try:
         with open(log_file_path, 'w') as f: # 'w' mode truncates the file
@@ -62,52 +322,55 @@ def log(message, level='info', task_name=""):
     Logs a message to stdout and a log file, respecting verbosity settings and adding color.
     
     Args:
-        message (str): The message to log.
+        message (str | callable): The message to log, or a zero-argument callable returning it.
+            A callable is only invoked when the message is actually emitted, so callers can
+            defer costly formatting.
         level (str): The log level ('debug', 'info', 'normal', 'step', 'success', 'warning', 'error', 'critical').
-        task_name (str): Optional name of the task, only used for log file consistency now.
+        task_name (str): Optional name of the task; defaults to the thread's current task
+            (see set_current_task). Written to the log file, and to the console when
+            set_console_task_prefix is on.
     """
-    global _verbose_enabled
-    
-    # Define which levels are displayed by default (without --verbose)
-    default_display_levels = ['info', 'step', 'normal', 'success', 'warning', 'error', 'critical']
+    # Debug messages are dropped entirely (console and file) unless verbose is enabled
+    if level == 'debug' and not _verbose_enabled:
+        return
 
-    # Determine if this message should be displayed to the console
-    # Debug messages only show if verbose is enabled
-    display_to_console = _verbose_enabled or (level in default_display_levels and level != 'debug')
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # One table lookup gives the color, the file label, whether the console shows it
+    # and the rank compared against the log file threshold
+    color_code, level_separator, shown_by_default, file_rank = _LEVEL_TABLE.get(level) or ("", f" | {level.upper()} | ".encode('utf-8'), False, _FILE_LEVEL_RANK['info'])
+    display_to_console = shown_by_default or _verbose_enabled
+    write_to_file = _file_logging_enabled and (_verbose_enabled or file_rank >= _file_min_level)
+    if not display_to_console and not write_to_file:
+        return # Nowhere to send it; skip all formatting
+
+    if callable(message):
+        message = message()
+    if not task_name:
+        task_name = getattr(_thread_context, 'task_name', "")
     
     # --- Construct message for CONSOLE ---
     # The 'message' parameter directly contains any icons or specific phrasing.
-    console_message = message
-    
-    # Determine color for console output
-    color_map = {
-        'debug': Colors.GRAY,
-        'info': Colors.BLUE,
-        'normal': Colors.RESET,
-        'step': Colors.CYAN,
-        'success': Colors.GREEN,
-        'warning': Colors.YELLOW,
-        'error': Colors.RED + Colors.BOLD, # Make errors bold
-        'critical': Colors.RED + Colors.BOLD # Critical errors also bold red
-    }
-    color_code = color_map.get(level, Colors.RESET)
-    
     # Print to console only if allowed by verbosity settings, with color
     if display_to_console:
-        print(f"{color_code}{console_message}{Colors.RESET}")
+        console_message = message
+        if _console_task_prefix and task_name:
+            body = message.lstrip("\n") # Blank lines before a section stay above the prefix
+            console_message = f"{message[:len(message) - len(body)]}[{task_name}] {body}"
+        with _console_lock:
+            _LOG_BUFFER.extend((color_code, console_message, _LINE_END))
+            if len(_LOG_BUFFER) >= _LOG_BUFFER_MAX_PIECES or level in _CONSOLE_FLUSH_LEVELS:
+                _flush_console_buffer()
+
+    if not write_to_file:
+        return
 
     # --- Construct message for LOG FILE ---
     # The log file will contain: TIMESTAMP | LEVEL | [TASK_NAME] | RAW_MESSAGE
-    log_level_upper = level.upper()
-    task_prefix = f"[{task_name}] " if task_name else ""
-    log_line_to_file = f"{timestamp} | {log_level_upper} | {task_prefix}{message}" 
+    # Timestamp and level separator are cached as bytes; only the variable parts get encoded.
+    task_prefix = _TASK_PREFIX_CACHE.get(task_name)
+    if task_prefix is None:
+        task_prefix = _TASK_PREFIX_CACHE[task_name] = f"[{task_name}] ".encode('utf-8')
+    log_line_to_file = b"".join((_timestamp(), level_separator, task_prefix, message.encode('utf-8'), b"\n"))
 
-    # Always write to log file, regardless of console display settings
-    log_file_path = get_log_file_path()
-    try:
-        with open(log_file_path, 'a') as f:
-            f.write(log_line_to_file + '\n')
-    except IOError as e:
-        print(f"Error: Failed to write to log file {log_file_path}: {e}")
\ No newline at end of file
+    # Write to log file regardless of console display settings.
+    # Errors are flushed right away so they are on disk even if the process dies.
+    _enqueue_log_bytes(log_line_to_file, level in _FILE_FLUSH_LEVELS)
@@ -1,7 +1,11 @@
 # core/messages.py
 
+import sys
+
 # A dictionary to hold all log messages
 # You can categorize them further if needed (e.g., by module or type)
+# Keys are string literals, whose hashes Python caches, so a lookup is a single
+# dict probe; messages that are expensive to format are passed to log() lazily.
 MESSAGES = {
     # General Messages
     "info_cli_from_arg": "CLI",
@@ -23,6 +27,7 @@ MESSAGES = {
     "workflow_task_update_mode_active": "  Running in Update Mode: Will sync repo and commit changes.",
     "workflow_error_missing_repo_path": "Error for '{}': 'git_repo_path' is missing in config.json and not provided via --folder.",
     "workflow_task_aborted_missing_info": "Task '{}' aborted due to missing essential information.",
+    "workflow_error_invalid_min_run_interval": "Task '{}' aborted: 'min_run_interval' must be a number of seconds, 0 or more (got {!r}).",
     "workflow_repo_not_found_init_attempt": "Git repository not found at '{}'. Attempting to initialize...",
     "workflow_repo_init_failed": "Task '{}' aborted: Git repository initialization failed.",
     "workflow_repo_init_success": "Git repository initialized successfully.",
@@ -30,7 +35,6 @@ MESSAGES = {
     "workflow_hint_use_initialize": "To initialize it, use the --initialize flag.",
     "workflow_task_aborted_repo_setup": "Task '{}' aborted as Git repository is not set up correctly.",
     "workflow_repo_found": "Git repository found at '{}'.",
-    "workflow_checkout_branch_step": "Checking out or creating branch '{}'",
     "workflow_checkout_branch_failed": "Task '{}' aborted: Failed to checkout or create branch '{}'.",
     "workflow_initial_pull": "Performing initial Git Pull",
     "workflow_initial_pull_success": "Initial Git Pull completed successfully.",
@@ -52,30 +56,48 @@ MESSAGES = {
     "workflow_final_pull": "Performing final Git Pull (post-push sync)",
     "workflow_final_pull_success": "Final Git Pull completed successfully.",
     "workflow_final_pull_failed_warning": "Task '{}' completed with warnings: Final Git Pull failed.",
+    "workflow_skip_stash_branch_in_sync": "Branch already matches origin. Keeping local changes in place (no stash needed).",
+    "workflow_skip_stash_no_overlap": "Incoming changes don't touch locally changed files. Keeping local changes in place (no stash needed).",
+    "workflow_no_commits_skip_final_pull": "No new commits were pushed. Skipping final Git Pull.",
+    "workflow_skipped_recent_run": "Task '{}' last ran {:.0f}s ago and the repository is unchanged since (min_run_interval: {}s). Skipping.",
     "workflow_task_completed_success": "Task '{}' completed successfully!",
+    "workflow_task_completed_with_errors": "Task '{}' ran to the end, but some steps failed (see above).",
+    "workflow_running_tasks_parallel": "Running {} tasks with up to {} in parallel.",
+    "workflow_parallel_task_failed": "Task from '{}' failed.",
+    "workflow_parallel_task_error": "Task '{}' stopped by an unexpected error: {}",
+    "workflow_parallel_summary": "{} of {} tasks completed successfully.",
 
     # Git Logic Messages
     "git_executing_command": "Executing Git command: {} in '{}'",
     "git_stdout": "Git STDOUT:\n{}",
     "git_stderr": "Git STDERR:\n{}",
+    "git_output_line": "  git> {}",
     "git_command_failed": "Git command FAILED with exit code {}.",
+    "git_command_answered_no": "Git command answered 'no' (exit code {}).",
+    "git_stash_empty_exit": "Git found no stash entries (exit code {}).",
+    "git_cache_hit": "Reusing cached result of 'git {}'.",
     "git_error_not_found": "Error: 'git' command not found. Please ensure Git is installed and in your PATH.",
     "git_error_unexpected": "An unexpected error occurred while running Git command: {}",
     "git_pulling_updates": "Pulling updates for branch '{}'...",
     "git_pull_failed": "Git Pull failed for branch '{}'.",
     "git_pull_successful": "Git Pull successful.",
-    "git_checking_status": "Checking for pending changes using 'git status --porcelain'...",
+    "git_pull_already_up_to_date": "Branch '{}' already matches origin. Skipping pull.",
+    "git_pull_fast_forward_not_possible": "Branch '{}' cannot be fast-forwarded to origin. Running 'git pull' to merge.",
+    "git_checking_status": "Checking for pending changes using 'git status --porcelain=v2'...",
     "git_error_status_check": "Error during Git status check.",
     "git_changes_detected": "Changes detected.",
     "git_no_changes_detected": "No changes detected.",
     "git_staging_changes": "Staging changes ('{}')...",
     "git_add_failed": "Git Add failed.",
+    "git_nothing_to_commit": "Working tree is clean. Nothing to stage or commit.",
+    "git_nothing_staged_for_pathspec": "No changes in '{}' to commit.",
     "git_committing_changes": "Committing changes with message: '{}'...",
     "git_commit_failed": "Git Commit failed.",
     "git_add_commit_successful": "Git Add and Commit successful.",
     "git_pushing_changes": "Pushing changes to '{}/{}'...",
     "git_push_failed": "Git Push failed to '{}/{}'.",
     "git_push_successful": "Git Push successful.",
+    "git_push_no_branches": "No branches given to push. Skipping Git Push.",
     "git_repo_already_exists": "Git repository already exists at '{}'. Skipping initialization.",
     "git_initializing_repo": "Initializing new Git repository at '{}'...",
     "git_created_dir_for_repo": "Created directory for repository: '{}'",
@@ -101,6 +123,7 @@ MESSAGES = {
     "git_create_checkout_successful": "Successfully created and checked out new branch '{}'.",
     "git_pushing_new_branch": "Pushing new branch '{}' to '{}' to set upstream...",
     "git_push_new_branch_failed_warning": "Failed to push new branch '{}' to '{}'.",
+    "git_already_on_branch": "Already on branch '{}'. Skipping branch detection.",
     "git_branch_op_completed": "Branch operation for '{}' completed.",
     "git_executing_generate_message_command": "Executing command to generate commit message: '{}'",
     "git_generate_message_command_failed": "Failed to generate commit message from command. Using default message.",
@@ -138,6 +161,9 @@ MESSAGES = {
     "cli_task_identifier_help": "The name of the task (e.g., 'my_backup') which resolves to 'config_dir/my_backup.json', OR a direct path to a config file (e.g., 'path/to/my_config.json').",
     "cli_create_help": "Create a new JSON configuration file with the given task name.",
     "cli_edit_help": "Open the identified JSON configuration file in the default text editor. Requires a 'task_identifier' or '--json' path.",
+    "cli_all_help": "Run every task found in the config directory. Tasks for different repositories run in parallel; tasks sharing a repository run one after another.",
+    "cli_jobs_help": "Maximum number of tasks to run at the same time with --all. Defaults to about 3/4 of the CPU count.",
+    "cli_all_no_tasks": "No task configuration files found in '{}'. Nothing to run.",
     "cli_list_help": "List all configured tasks found in the config directory, showing their name, branch, and local repository location.",
     "cli_json_help": "Explicitly specify the full path to the JSON configuration file to load/edit. This overrides the positional 'task_identifier' if it was a task name.",
     "cli_fix_json_help": "Add missing default keys to all existing JSON configuration files.",
@@ -147,6 +173,7 @@ MESSAGES = {
     "cli_origin_override_help": "Overrides the 'origin' specified in the config file for this run or pre-fills it during creation.",
     "cli_folder_help": "Overrides the 'git_repo_path' specified in the config file for this run or pre-fills it during creation. This should be the absolute path to your local Git repository.",
     "cli_verbose_help": "Enable verbose output for detailed logging of operations.",
+    "cli_no_log_file_help": "Do not write messages to the log file for this run.",
     "cli_overwrite_help": "When creating a configuration file, overwrite it if it already exists.",
     "cli_initialize_help": "Initialize the Git repository if it does not exist at the specified 'git_repo_path'.",
     "cli_update_help": "Run the task in 'update mode': sync repo, commit changes, skip command_line.",
@@ -171,6 +198,7 @@ MESSAGES = {
     "cli_error_unexpected_opening_file": "An unexpected error occurred while trying to open the file: {}",
     "cli_revert_confirmation": "WARNING: This will create a new commit that undoes the changes of commit '{}'. This action cannot be easily undone. Do you wish to proceed? (yes/no): ",
     "cli_revert_aborted": "Revert aborted by user.",
+    "cli_revert_no_answer": "No confirmation received (input closed or interrupted). Revert cancelled.",
     "cli_error_no_task_for_git_action": "Error: No task identifier or --json path provided. Git actions like '--show-last-commits' or '--revert-commit' require a target repository from a task configuration.",
 
     # Config Operations Messages
@@ -197,4 +225,8 @@ MESSAGES = {
     "config_fixed_skipped_malformed": "  Skipping '{}': Malformed JSON.",
     "config_fixed_error": "  Error fixing '{}': {}",
     "config_finished_fixing_jsons": "Finished fixing JSON config files.",
-}
\ No newline at end of file
+}
+
+# Intern the texts so each one exists once in memory; identical literals compiled into
+# other modules (and any runtime-built copies passed through sys.intern) share the object.
+MESSAGES = {key: sys.intern(text) for key, text in MESSAGES.items()}
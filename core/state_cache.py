@@ -0,0 +1,106 @@
+# core/state_cache.py
+
+import json
+import os
+import threading
+import time
+from core.logger import get_log_file_path
+
+try:
+    import fcntl
+except ImportError: # Windows: only the in-process lock applies
+    fcntl = None
+
+# Remembers, per repository, what it looked like after the last successful run:
+# {repo_path: {"head": sha, "index_mtime": ns, "last_run": epoch seconds}}.
+# Only consulted for tasks with a "min_run_interval" (see is_fresh).
+
+_STATE_LOCK = threading.Lock() # Tasks run in threads under --all
+
+
+def _state_file_path():
+    """The state file lives next to the log file."""
+    return os.path.join(os.path.dirname(get_log_file_path()), "state.json")
+
+
+class _StateFileLock:
+    """Serializes read-modify-write of the state file across threads and processes."""
+    def __enter__(self):
+        _STATE_LOCK.acquire()
+        self._fd = None
+        if fcntl is not None:
+            try:
+                path = _state_file_path()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._fd = os.open(path + ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError:
+                self._fd = None # Best effort: still safe within this process
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._fd is not None:
+            os.close(self._fd) # Closing releases the flock
+        _STATE_LOCK.release()
+        return False
+
+
+def load():
+    """Returns the saved state, or an empty dict if there is none or it is unreadable."""
+    try:
+        with open(_state_file_path(), 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save(state):
+    """Writes the state atomically (temporary file + os.replace)."""
+    path = _state_file_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def index_mtime(git_dir):
+    """Returns the mtime (ns) of the repository's index file, or None if it has none."""
+    try:
+        return os.stat(os.path.join(git_dir, "index")).st_mtime_ns
+    except OSError:
+        return None
+
+
+def is_fresh(repo_path, head_sha, index_mtime_ns, min_interval):
+    """
+    Returns the seconds since the last successful run if it was less than
+    min_interval seconds ago and HEAD and the index are unchanged since; otherwise None.
+    Edits to tracked files don't touch the index, so they are picked up by the first
+    run after the interval, not before.
+    """
+    entry = load().get(os.path.realpath(repo_path))
+    if not isinstance(entry, dict) or not head_sha:
+        return None
+    if entry.get("head") != head_sha or entry.get("index_mtime") != index_mtime_ns:
+        return None
+    last_run = entry.get("last_run")
+    if isinstance(last_run, bool) or not isinstance(last_run, (int, float)):
+        return None # Missing or corrupt entry: treat the repository as never backed up
+    age = time.time() - last_run
+    return age if 0 <= age < min_interval else None
+
+
+def record_run(repo_path, head_sha, index_mtime_ns):
+    """Stores the state of repo_path after a successful run."""
+    with _StateFileLock():
+        state = load()
+        state[os.path.realpath(repo_path)] = {"head": head_sha, "index_mtime": index_mtime_ns, "last_run": time.time()}
+        save(state)
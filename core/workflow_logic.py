@@ -1,48 +1,143 @@
 # core/workflow_logic.py
 
 import os
-import sys
-from datetime import datetime
-from core.logger import log
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from core.logger import log, flush_log, set_console_task_prefix, set_current_task
 from core.command_logic import execute_command
 from core.messages import MESSAGES
+from core import state_cache
 
 from core.git_logic import (
     initialize_repo,
+    get_repo_context,
     checkout_or_create_branch,
     pull_updates,
     diff_changes, # Checks for all changes (staged, unstaged, untracked)
     add_commit_changes,
     push_updates,
     _check_for_unstaged_changes, # Checks specifically for unstaged/uncommitted changes
+    _local_head_sha,
     stash_local_changes,         # Function to stash changes
-    pop_stashed_changes          # Function to pop stash
+    pop_stashed_changes,         # Function to pop stash
+    prefetch_remote_branch,
+    is_branch_in_sync,
+    fetch_updates,
+    pull_touches_local_changes,
+    invalidate_git_cache,
+    set_git_env_default,
+    close_persistent_git
 )
 
 
+# Without a commit, the final pull is only repeated when the initial pull is at
+# least this old (seconds), e.g. after a long command_line.
+_FINAL_PULL_MIN_AGE = 60
+
+
+class WorkflowAbort(Exception):
+    """
+    Raised by run_task_workflow when a task cannot continue. reason is the error
+    message for the user; the caller logs it and decides whether to exit or move on.
+    """
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowConfig:
+    """The settings of one task run, resolved from the task config and CLI overrides."""
+    task_name: str
+    command_line: str
+    default_commit_message: str
+    generate_commit_message_command: Optional[str]
+    handle_local_changes: str
+    git_repo_path: Optional[str]
+    repo_path_source: str # Where git_repo_path came from, for the task details log
+    branch: str
+    branch_source: str
+    origin: str
+    origin_source: str
+    min_run_interval: float # Seconds; 0 disables the skip of recently backed-up, unchanged repos
+
+
+def _min_run_interval(task, task_name):
+    """Reads the task's min_run_interval as seconds; raises WorkflowAbort if it isn't a number >= 0."""
+    value = task.get("min_run_interval") or 0
+    try:
+        seconds = float(value) if not isinstance(value, bool) else -1.0
+    except (TypeError, ValueError):
+        seconds = -1.0
+    if not seconds >= 0: # Also rejects NaN
+        raise WorkflowAbort(MESSAGES["workflow_error_invalid_min_run_interval"].format(task_name, value))
+    return seconds
+
+
+def _prepare_task(args, task):
+    """
+    Builds the WorkflowConfig for a task. Each value comes from the CLI when given there, otherwise from the task config.
+    Raises WorkflowAbort if a config value is invalid.
+    """
+    task_name = task.get("name", "Unnamed Task")
+    from_cli, from_config, from_config_default = MESSAGES["info_cli_from_arg"], MESSAGES["info_cli_from_config"], MESSAGES["info_cli_from_config_default"]
+    if args.folder is not None:
+        git_repo_path, repo_path_source = args.folder, from_cli
+    else:
+        git_repo_path, repo_path_source = task.get("git_repo_path"), from_config
+    if args.branch is not None:
+        branch, branch_source = args.branch, from_cli
+    else:
+        branch, branch_source = task.get("branch", "main"), from_config_default
+    if args.origin is not None:
+        origin, origin_source = args.origin, from_cli
+    else:
+        origin, origin_source = task.get("origin", "origin"), from_config_default
+
+    return WorkflowConfig(
+        task_name=task_name,
+        command_line=task.get("command_line", ""),
+        default_commit_message=task["default_commit_message"] if "default_commit_message" in task else f"Automated update for {task_name}",
+        generate_commit_message_command=task.get("generate_commit_message_command", None),
+        handle_local_changes=task.get("handle_local_changes_before_pull", "auto_stash"),
+        git_repo_path=git_repo_path,
+        repo_path_source=repo_path_source,
+        branch=branch,
+        branch_source=branch_source,
+        origin=origin,
+        origin_source=origin_source,
+        min_run_interval=_min_run_interval(task, task_name)
+    )
+
+
 def run_task_workflow(args, task, config_file_path, update_mode=False): # ADDED update_mode=False
     """
     Executes the full Git automation workflow for a given task.
     If update_mode is True, it performs git sync (stash/pull/pop) and commit/push,
     skipping the command_line execution.
+    Raises WorkflowAbort if a step fails. Returns True if every step succeeded, False
+    if the task ran to the end but a later step failed (stash pop, push or final pull).
     """
     log(MESSAGES["workflow_start_task"].format(config_file_path), level='step')
 
-    task_name = task.get("name", "Unnamed Task")
-    command_line = task.get("command_line", "")
-    
-    default_commit_message = task.get("default_commit_message", f"Automated update for {task_name}")
-    generate_commit_message_command = task.get("generate_commit_message_command", None)
-    handle_local_changes = task.get("handle_local_changes_before_pull", "auto_stash") 
-
-    git_repo_path = args.folder if args.folder is not None else task.get("git_repo_path")
-    branch = args.branch if args.branch is not None else task.get("branch", "main")
-    origin = args.origin if args.origin is not None else task.get("origin", "origin")
+    config = _prepare_task(args, task)
+    task_name = config.task_name
+    command_line = config.command_line
+    default_commit_message = config.default_commit_message
+    generate_commit_message_command = config.generate_commit_message_command
+    handle_local_changes = config.handle_local_changes
+    git_repo_path, repo_path_source = config.git_repo_path, config.repo_path_source
+    branch, branch_source = config.branch, config.branch_source
+    origin, origin_source = config.origin, config.origin_source
 
     log(MESSAGES["workflow_task_details"].format(task_name), level='normal')
-    log(MESSAGES["workflow_git_repo_path"].format(git_repo_path, MESSAGES["info_cli_from_arg"] if args.folder is not None else MESSAGES["info_cli_from_config"]), level='normal')
-    log(MESSAGES["workflow_branch"].format(branch, MESSAGES["info_cli_from_arg"] if args.branch is not None else MESSAGES["info_cli_from_config_default"]), level='normal')
-    log(MESSAGES["workflow_origin"].format(origin, MESSAGES["info_cli_from_arg"] if args.origin is not None else MESSAGES["info_cli_from_config_default"]), level='normal')
+    log(MESSAGES["workflow_git_repo_path"].format(git_repo_path, repo_path_source), level='normal')
+    log(MESSAGES["workflow_branch"].format(branch, branch_source), level='normal')
+    log(MESSAGES["workflow_origin"].format(origin, origin_source), level='normal')
     
     # Only log command_line if not in update_mode
     if not update_mode:
@@ -69,71 +164,98 @@ def run_task_workflow(args, task, config_file_path, update_mode=False): # ADDED
     # --- Pre-requisite checks & Initialization ---
     if not git_repo_path:
         log(MESSAGES["workflow_error_missing_repo_path"].format(task_name), level='error')
-        log(MESSAGES["workflow_task_aborted_missing_info"].format(task_name), level='error')
-        sys.exit(1)
+        raise WorkflowAbort(MESSAGES["workflow_task_aborted_missing_info"].format(task_name))
 
-    git_dir_exists = os.path.exists(os.path.join(git_repo_path, '.git'))
+    repo_context = get_repo_context(git_repo_path) # One stat of '.git', reused for the rest of the run
+    git_dir_exists = repo_context.git_dir is not None
     
     if not git_dir_exists:
         if args.initialize:
             log(MESSAGES["workflow_repo_not_found_init_attempt"].format(git_repo_path), level='step', task_name=task_name)
             if not initialize_repo(git_repo_path, origin_url=origin, task_name=task_name):
-                log(MESSAGES["workflow_repo_init_failed"].format(task_name), level='error')
-                sys.exit(1)
+                raise WorkflowAbort(MESSAGES["workflow_repo_init_failed"].format(task_name))
             log(MESSAGES["workflow_repo_init_success"], level='success', task_name=task_name)
         else:
             log(MESSAGES["workflow_error_repo_not_valid"].format(task_name, git_repo_path), level='error')
             log(MESSAGES["workflow_hint_use_initialize"], level='error')
-            log(MESSAGES["workflow_task_aborted_repo_setup"].format(task_name), level='error')
-            sys.exit(1)
+            raise WorkflowAbort(MESSAGES["workflow_task_aborted_repo_setup"].format(task_name))
     else:
         log(MESSAGES["workflow_repo_found"].format(git_repo_path), level='normal', task_name=task_name)
+        if config.min_run_interval > 0:
+            age = state_cache.is_fresh(git_repo_path, _local_head_sha(git_repo_path, task_name),
+                                       state_cache.index_mtime(repo_context.git_dir), config.min_run_interval)
+            if age is not None:
+                log(MESSAGES["workflow_skipped_recent_run"].format(task_name, age, config.min_run_interval), level='success', task_name=task_name)
+                flush_log()
+                return True
+
+    # pull_updates starts with a remote lookup (ls-remote) that waits on the network;
+    # run it now so it overlaps the branch check and the local change check, and hand
+    # the answer to the pull. It only depends on the remote, so a branch switch in
+    # between doesn't make it wrong. It must not prompt for credentials while the branch
+    # check may be prompting; if it needed them, the pull asks again in the foreground.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        remote_sha_future = executor.submit(prefetch_remote_branch, git_repo_path, branch, task_name, origin, interactive=False)
 
-    # --- Checkout or Create Branch ---
-    if not checkout_or_create_branch(git_repo_path, branch, origin, task_name):
-        log(MESSAGES["workflow_checkout_branch_failed"].format(task_name, branch), level='error')
-        sys.exit(1)
+        # --- Checkout or Create Branch ---
+        if not checkout_or_create_branch(git_repo_path, branch, origin, task_name):
+            raise WorkflowAbort(MESSAGES["workflow_checkout_branch_failed"].format(task_name, branch))
+
+        has_uncommitted_changes = _check_for_unstaged_changes(git_repo_path, task_name)
+    remote_sha = remote_sha_future.result()
 
     # --- Initial Git Pull (always performed in update_mode, or as part of normal flow) ---
     stashed_by_workflow = False
-    
-    has_uncommitted_changes = _check_for_unstaged_changes(git_repo_path, task_name)
+    fetched = False
 
     if has_uncommitted_changes:
         if handle_local_changes == "auto_stash":
-            if not stash_local_changes(git_repo_path, task_name):
-                log(MESSAGES["workflow_initial_pull_failed"].format(task_name), level='error')
-                sys.exit(1)
-            stashed_by_workflow = True
+            if is_branch_in_sync(git_repo_path, branch, task_name, remote_sha=remote_sha, origin=origin):
+                # Nothing will be pulled, so the local changes can stay in place
+                log(MESSAGES["workflow_skip_stash_branch_in_sync"], level='normal', task_name=task_name)
+            else:
+                fetched = fetch_updates(git_repo_path, branch, task_name, origin)
+                if fetched and not pull_touches_local_changes(git_repo_path, task_name):
+                    # A fast-forward that leaves every locally changed path alone
+                    log(MESSAGES["workflow_skip_stash_no_overlap"], level='normal', task_name=task_name)
+                elif not stash_local_changes(git_repo_path, task_name):
+                    raise WorkflowAbort(MESSAGES["workflow_initial_pull_failed"].format(task_name))
+                else:
+                    stashed_by_workflow = True
         elif handle_local_changes == "fail":
-            log(MESSAGES["workflow_initial_pull_failed"].format(task_name), level='error')
-            sys.exit(1)
+            raise WorkflowAbort(MESSAGES["workflow_initial_pull_failed"].format(task_name))
         else:
-            log(f"Error: Unknown setting for 'handle_local_changes_before_pull': {handle_local_changes}. Aborting.", level='error', task_name=task_name)
-            sys.exit(1)
+            raise WorkflowAbort(f"Error: Unknown setting for 'handle_local_changes_before_pull': {handle_local_changes}. Aborting.")
 
     log(MESSAGES["workflow_initial_pull"], level='step', task_name=task_name)
-    if pull_updates(git_repo_path, branch, task_name):
+    if pull_updates(git_repo_path, branch, task_name, fetched=fetched, remote_sha=remote_sha, origin=origin):
         log(MESSAGES["workflow_initial_pull_success"], level='success', task_name=task_name)
+        initial_pull_time = time.monotonic()
     else:
-        log(MESSAGES["workflow_initial_pull_failed"].format(task_name), level='error')
-        sys.exit(1)
+        raise WorkflowAbort(MESSAGES["workflow_initial_pull_failed"].format(task_name))
 
+    # Steps after this point log their failure and let the task finish, but the task
+    # then counts as failed
+    completed_with_errors = False
+
+    restored_stash = False
     if stashed_by_workflow:
-        if not pop_stashed_changes(git_repo_path, task_name):
-            log(MESSAGES["workflow_task_completed_success"].format(task_name) + " with warnings.", level='warning', task_name=task_name)
-            log(MESSAGES["git_stash_pop_failed_conflict"], level='warning', task_name=task_name)
+        restored_stash = pop_stashed_changes(git_repo_path, task_name)
+        if not restored_stash:
+            log(MESSAGES["git_stash_pop_failed_conflict"], level='error', task_name=task_name)
+            completed_with_errors = True
     # END NEW LOGIC
 
     # --- Execute Command Line (SKIPPED if in update_mode) ---
     if not update_mode: # Conditional execution of command_line
         log(MESSAGES["workflow_executing_command_line"], level='step', task_name=task_name)
         if command_line:
-            if execute_command(command_line, task_name, cwd=git_repo_path):
+            _, command_ok = execute_command(command_line, task_name, cwd=git_repo_path)
+            invalidate_git_cache(git_repo_path) # The command may have changed the working tree
+            if command_ok:
                 log(MESSAGES["workflow_command_execution_success"], level='success', task_name=task_name)
             else:
-                log(MESSAGES["workflow_command_execution_failed"].format(task_name), level='error')
-                sys.exit(1)
+                raise WorkflowAbort(MESSAGES["workflow_command_execution_failed"].format(task_name))
         else:
             log(MESSAGES["workflow_no_command_line"], level='normal', task_name=task_name)
     else: # If in update mode, log that command_line is skipped (if it exists)
@@ -154,19 +276,25 @@ def run_task_workflow(args, task, config_file_path, update_mode=False): # ADDED
 
     # --- Check for Changes & Commit ---
     log(MESSAGES["workflow_checking_for_changes"], level='step', task_name=task_name)
-    changes_found = diff_changes(git_repo_path, task_name) # This checks for ALL changes
+    if update_mode and has_uncommitted_changes and (restored_stash or not stashed_by_workflow):
+        # The local changes found before the pull are still in the tree (left in place by a
+        # pull that could not touch them, or stashed and restored) and no command_line ran,
+        # so the tree is known to be dirty without another 'git status'. add_commit_changes
+        # still reads the actual status before staging anything.
+        log(MESSAGES["git_changes_detected"], level='normal', task_name=task_name)
+        changes_found = True
+    else:
+        changes_found = diff_changes(git_repo_path, task_name) # This checks for ALL changes
 
     if changes_found is None:
-        log(MESSAGES["workflow_error_diff_check_failed"].format(task_name), level='error')
-        sys.exit(1)
+        raise WorkflowAbort(MESSAGES["workflow_error_diff_check_failed"].format(task_name))
     elif changes_found:
         log(MESSAGES["workflow_changes_detected_add_commit"], level='step', task_name=task_name)
         if add_commit_changes(git_repo_path, final_commit_base_message, ".", task_name):
             log(MESSAGES["workflow_git_add_commit_success"], level='success', task_name=task_name)
             commit_successful = True
         else:
-            log(MESSAGES["workflow_git_add_commit_failed"].format(task_name), level='error')
-            sys.exit(1)
+            raise WorkflowAbort(MESSAGES["workflow_git_add_commit_failed"].format(task_name))
     else:
         log(MESSAGES["workflow_no_changes_skip_commit"], level='normal', task_name=task_name)
         commit_successful = False
@@ -179,16 +307,115 @@ def run_task_workflow(args, task, config_file_path, update_mode=False): # ADDED
             log(MESSAGES["workflow_git_push_success"], level='success', task_name=task_name)
         else:
             log(MESSAGES["workflow_git_push_failed_warning"].format(task_name), level='error')
+            completed_with_errors = True
     else:
         log(MESSAGES["workflow_no_commits_skip_push"], level='normal', task_name=task_name)
 
 
     # --- Final Git Pull (Post-push sync) ---
-    log(MESSAGES["workflow_final_pull"], level='step', task_name=task_name)
-    if pull_updates(git_repo_path, branch, task_name):
-        log(MESSAGES["workflow_final_pull_success"], level='success', task_name=task_name)
+    # Without a commit nothing was pushed, and the initial pull synced the branch moments ago
+    if commit_successful or time.monotonic() - initial_pull_time > _FINAL_PULL_MIN_AGE:
+        log(MESSAGES["workflow_final_pull"], level='step', task_name=task_name)
+        if pull_updates(git_repo_path, branch, task_name, origin=origin):
+            log(MESSAGES["workflow_final_pull_success"], level='success', task_name=task_name)
+        else:
+            log(MESSAGES["workflow_final_pull_failed_warning"].format(task_name), level='error')
+            completed_with_errors = True
     else:
-        log(MESSAGES["workflow_final_pull_failed_warning"].format(task_name), level='error')
+        log(MESSAGES["workflow_no_commits_skip_final_pull"], level='normal', task_name=task_name)
+
+
+    if completed_with_errors:
+        log(MESSAGES["workflow_task_completed_with_errors"].format(task_name), level='error', task_name=task_name)
+        flush_log()
+        return False
+
+    if config.min_run_interval > 0:
+        state_cache.record_run(git_repo_path, _local_head_sha(git_repo_path, task_name),
+                               state_cache.index_mtime(get_repo_context(git_repo_path).git_dir))
+
+    log(MESSAGES["workflow_task_completed_success"].format(task_name), level='success', task_name=task_name)
+    flush_log() # Task boundary: make sure the whole run is on disk
+    return True
+
+
+# One lock per repository (by real path), so tasks that share a repository never
+# run their git operations at the same time.
+_REPO_LOCKS = defaultdict(threading.Lock)
+_REPO_LOCKS_GUARD = threading.Lock()
+
+
+def _repo_lock(git_repo_path, config_file_path):
+    key = os.path.realpath(git_repo_path) if git_repo_path else config_file_path
+    with _REPO_LOCKS_GUARD:
+        return _REPO_LOCKS[key]
+
+
+def _run_task_guarded(args, task, config_file_path, update_mode):
+    """
+    Runs one task for run_tasks_parallel and reports whether it succeeded.
+    Any error only ends this task; the other tasks keep running.
+    """
+    task_name = task.get("name", "Unnamed Task")
+    set_current_task(task_name) # Lines logged without a task name still get this one
+    try:
+        git_repo_path = _prepare_task(args, task).git_repo_path
+        with _repo_lock(git_repo_path, config_file_path):
+            # Cached answers from an earlier task on this repository may be stale by now
+            # (another task may have pushed to the same remote), and must not outlive this one
+            if git_repo_path:
+                invalidate_git_cache(git_repo_path)
+            try:
+                succeeded = run_task_workflow(args, task, config_file_path, update_mode=update_mode)
+            finally:
+                if git_repo_path:
+                    invalidate_git_cache(git_repo_path)
+                    # Don't keep one idle 'cat-file --batch' process per finished repository
+                    close_persistent_git(git_repo_path)
+    except WorkflowAbort as e:
+        log(e.reason, level='error', task_name=task_name)
+        succeeded = False
+    except Exception as e:
+        log(MESSAGES["workflow_parallel_task_error"].format(task_name, e), level='error', task_name=task_name)
+        succeeded = False
+    if not succeeded:
+        log(MESSAGES["workflow_parallel_task_failed"].format(config_file_path), level='error', task_name=task_name)
+    set_current_task("")
+    return succeeded
+
+
+def run_tasks_parallel(tasks, args, max_workers=None, update_mode=False, failed_config_files=()):
+    """
+    Runs several tasks concurrently. tasks is a list of (task, config_file_path) pairs.
+    Each task spends most of its time waiting on git and the network, so tasks for
+    different repositories overlap well; tasks for the same repository are serialized.
+    failed_config_files are config files that could not be loaded; each counts as a
+    failed task in the summary.
+    Returns True if every task succeeded.
+    """
+    for config_file_path in failed_config_files:
+        log(MESSAGES["workflow_parallel_task_failed"].format(config_file_path), level='error')
+    total = len(tasks) + len(failed_config_files)
+    if not tasks:
+        if failed_config_files:
+            log(MESSAGES["workflow_parallel_summary"].format(0, total), level='warning')
+        return not failed_config_files
+    if max_workers is None:
+        # Same ceiling as the git process limit in git_logic; more workers would only queue there
+        max_workers = (os.cpu_count() or 4) * 3 // 4
+    max_workers = max(1, min(max_workers, len(tasks)))
+    if max_workers > 1:
+        # Concurrent tasks can't share the terminal: fail instead of waiting on a credential prompt
+        set_git_env_default("GIT_TERMINAL_PROMPT", "0")
+        # Their console lines interleave, so each one names its task
+        set_console_task_prefix(True)
 
+    log(MESSAGES["workflow_running_tasks_parallel"].format(len(tasks), max_workers), level='step')
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_task_guarded, args, task, config_file_path, update_mode) for task, config_file_path in tasks]
+        results = [future.result() for future in futures]
 
-    log(MESSAGES["workflow_task_completed_success"].format(task_name), level='success', task_name=task_name)
\ No newline at end of file
+    succeeded = sum(results)
+    level = 'success' if succeeded == total else 'warning'
+    log(MESSAGES["workflow_parallel_summary"].format(succeeded, total), level=level)
+    return succeeded == total
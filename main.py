@@ -7,9 +7,9 @@ import subprocess
 from core.cli_parser import parse_arguments
 
 # Import functions for specific actions
-from core.logger import set_verbose, log
+from core.logger import set_verbose, set_file_logging, log, flush_console
 from core.messages import MESSAGES
-from core.workflow_logic import run_task_workflow
+from core.workflow_logic import run_task_workflow, run_tasks_parallel, WorkflowAbort
 from core.config_operations import create_config_file, fix_config_files, load_task_config # NEW: Import load_task_config
 from core.git_logic import get_last_commits, revert_commit # NEW: Import git logic functions
 
@@ -48,6 +48,7 @@ if __name__ == "__main__":
     args = parse_arguments()
 
     set_verbose(args.verbose)
+    set_file_logging(not args.no_log_file)
 
     # Determine the base directory for configs (either default or user-specified)
     effective_config_base_dir = os.path.abspath(args.config_dir)
@@ -125,10 +126,11 @@ if __name__ == "__main__":
     if args.list:
         log(MESSAGES["cli_listing_tasks_in"].format(effective_config_base_dir), level='step')
         tasks_found = False
-        if not os.listdir(effective_config_base_dir):
+        config_filenames = os.listdir(effective_config_base_dir)
+        if not config_filenames:
             log(MESSAGES["cli_no_config_files_found"].format(effective_config_base_dir), level='info')
         else:
-            for filename in os.listdir(effective_config_base_dir):
+            for filename in config_filenames:
                 if filename.endswith(".json"):
                     filepath = os.path.join(effective_config_base_dir, filename)
                     try:
@@ -177,8 +179,15 @@ if __name__ == "__main__":
         
         repo_path, task_name_for_log = _get_repo_path_from_task(args, effective_config_base_dir)
         
-        # Confirmation for revert
-        confirmation = input(MESSAGES["cli_revert_confirmation"].format(args.revert_commit)).strip().lower()
+        # Confirmation for revert. A piped answer ('echo yes | ...') is accepted; input that
+        # ends without one (cron, CI, /dev/null) cancels instead of raising EOFError.
+        flush_console() # Show everything logged so far before prompting
+        try:
+            confirmation = input(MESSAGES["cli_revert_confirmation"].format(args.revert_commit)).strip().lower()
+        except (EOFError, KeyboardInterrupt):
+            sys.stdout.write("\n") # End the prompt line
+            log(MESSAGES["cli_revert_no_answer"], level='warning')
+            sys.exit(1)
         if confirmation != 'yes':
             log(MESSAGES["cli_revert_aborted"], level='normal')
             sys.exit(0)
@@ -187,6 +196,27 @@ if __name__ == "__main__":
         sys.exit(0)
 
 
+    # --- Handle --all command ---
+    if args.all:
+        task_files = sorted(
+            os.path.join(effective_config_base_dir, filename)
+            for filename in os.listdir(effective_config_base_dir)
+            if filename.endswith(".json")
+        )
+        if not task_files:
+            log(MESSAGES["cli_all_no_tasks"].format(effective_config_base_dir), level='info')
+            sys.exit(0)
+        # A broken config file only fails its own task
+        tasks, unreadable_files = [], []
+        for filepath in task_files:
+            task = load_task_config(filepath, exit_on_error=False)
+            if task is None:
+                unreadable_files.append(filepath)
+            else:
+                tasks.append((task, filepath))
+        all_ok = run_tasks_parallel(tasks, args, max_workers=args.jobs, update_mode=args.update, failed_config_files=unreadable_files)
+        sys.exit(0 if all_ok else 1)
+
     # --- If none of the above specific actions (create, edit, list, fix-json, show-commits, revert-commit) were requested, then proceed to run a task ---
     config_file_path = None # Re-determine config_file_path as it might have been used/set by git actions helper
     if args.json:
@@ -218,4 +248,9 @@ if __name__ == "__main__":
     task = load_task_config(config_file_path) # Using the new helper
 
     # Call the extracted workflow function, passing the update flag
-    run_task_workflow(args, task, config_file_path, update_mode=args.update)
\ No newline at end of file
+    try:
+        if not run_task_workflow(args, task, config_file_path, update_mode=args.update):
+            sys.exit(1)
+    except WorkflowAbort as e:
+        log(e.reason, level='error')
+        sys.exit(1)
\ No newline at end of file